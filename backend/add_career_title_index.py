@@ -0,0 +1,90 @@
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+# Every career with the id of the career it is kept as (lowest id per normalized title)
+RANKED_CAREERS = """
+    WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY lower(trim(title))) AS keep_id
+        FROM careers
+    )
+"""
+
+async def add_career_title_index():
+    """Merge careers whose titles differ only by case/spaces, then add the unique normalized-title index."""
+    engine = create_async_engine(DATABASE_URL, echo=True)
+
+    print("🔄 Starting safe database migration to add uq_careers_normalized_title...")
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'careers' AND indexname = 'uq_careers_normalized_title'
+        """))
+
+        if result.fetchone():
+            print("⚠️ uq_careers_normalized_title already exists. Skipping.")
+        else:
+            print("🧹 Merging duplicate careers...")
+
+            # Keep one recommendation per student for each merged career
+            result = await conn.execute(text(RANKED_CAREERS + """
+                DELETE FROM student_career_recommendations r
+                USING ranked d
+                WHERE r.career_id = d.id
+                  AND d.id <> d.keep_id
+                  AND EXISTS (
+                      SELECT 1
+                      FROM student_career_recommendations k
+                      JOIN ranked dk ON dk.id = k.career_id
+                      WHERE k.student_id = r.student_id
+                        AND dk.keep_id = d.keep_id
+                        AND k.career_id < r.career_id
+                  )
+            """))
+            print(f"   - Removed {result.rowcount} duplicate recommendations")
+
+            result = await conn.execute(text(RANKED_CAREERS + """
+                UPDATE student_career_recommendations r
+                SET career_id = d.keep_id
+                FROM ranked d
+                WHERE r.career_id = d.id AND d.id <> d.keep_id
+            """))
+            print(f"   - Repointed {result.rowcount} recommendations")
+
+            result = await conn.execute(text(RANKED_CAREERS + """
+                DELETE FROM careers c
+                USING ranked d
+                WHERE c.id = d.id AND d.id <> d.keep_id
+            """))
+            print(f"   - Removed {result.rowcount} duplicate careers")
+
+            await conn.execute(text("UPDATE careers SET title = trim(title) WHERE title <> trim(title)"))
+
+            print("📥 Creating uq_careers_normalized_title...")
+            await conn.execute(text(
+                "CREATE UNIQUE INDEX uq_careers_normalized_title ON careers (lower(trim(title)))"
+            ))
+
+            print("✅ uq_careers_normalized_title created successfully!")
+
+    await engine.dispose()
+    print("✅ Safe migration completed!")
+    print("\n📋 New index:")
+    print("   - uq_careers_normalized_title: unique on lower(trim(careers.title))")
+    print("\n💡 Usage:")
+    print("   - Career recommendations are stored with bulk INSERT ... ON CONFLICT statements")
+    print("   - Creating or renaming a career to an existing title now returns 409")
+
+if __name__ == "__main__":
+    asyncio.run(add_career_title_index())
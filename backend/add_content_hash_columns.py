@@ -0,0 +1,36 @@
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+async def add_content_hash_columns():
+    """Add the content_hash columns ingest_catalog.py uses to skip unchanged records."""
+    engine = create_async_engine(DATABASE_URL, echo=True)
+
+    print("🔄 Starting safe database migration to add content_hash columns...")
+
+    async with engine.begin() as conn:
+        for table in ("careers", "programs"):
+            print(f"📥 Adding {table}.content_hash...")
+            await conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"
+            ))
+
+    await engine.dispose()
+    print("✅ Safe migration completed!")
+    print("\n📋 New columns:")
+    print("   - careers.content_hash, programs.content_hash: hash of the last ingested JSON record")
+    print("\n💡 Usage:")
+    print("   - Run add_career_title_index.py first if you haven't, then ingest_catalog.py")
+    print("   - Existing rows have no hash, so the first ingest rewrites them once")
+
+if __name__ == "__main__":
+    asyncio.run(add_content_hash_columns())
@@ -0,0 +1,31 @@
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+async def add_interview_session_version():
+    """Add the version column interview sessions are saved against."""
+    engine = create_async_engine(DATABASE_URL, echo=True)
+
+    print("🔄 Starting safe database migration to add interview_sessions.version...")
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0"
+        ))
+
+    await engine.dispose()
+    print("✅ Safe migration completed!")
+    print("\n📋 New columns:")
+    print("   - interview_sessions.version: bumped on every turn; a save against an older version is rejected")
+
+if __name__ == "__main__":
+    asyncio.run(add_interview_session_version())
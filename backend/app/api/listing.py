@@ -0,0 +1,106 @@
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+from fastapi import HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Rows fetched per round trip from the server-side cursor when streaming
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class ListParams:
+    """Query parameters shared by list endpoints: keyset cursor, page size, projection and format."""
+
+    def __init__(
+        self,
+        cursor: Optional[int] = Query(None, ge=0, description="Return rows with id greater than this (the previous page's X-Next-Cursor)"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description=f"Page size; defaults to {DEFAULT_PAGE_SIZE} when a cursor is sent"),
+        fields: Optional[str] = Query(None, description="Comma-separated columns to return; id is always included"),
+        format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson streams every row after the cursor, one JSON object per line"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.fields = fields
+        self.format = format
+
+
+def select_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Validate a `fields=` projection against the columns a list endpoint exposes."""
+    requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(allowed)
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return ["id"] + [field for field in dict.fromkeys(requested) if field != "id"]
+
+
+async def list_rows(session, model, params: ListParams, allowed: Sequence[str]) -> Response:
+    """One keyset page as a JSON array, or every row after the cursor as NDJSON.
+
+    Only the projected columns are selected, as plain rows rather than ORM
+    objects. Pages carry the next cursor in the X-Next-Cursor header, absent
+    on the last page. Without a cursor or limit every row is returned, as
+    clients written before pagination expect, streamed as one JSON array.
+    """
+    columns = select_fields(params.fields, allowed)
+    stmt = select(*(getattr(model, column) for column in columns)).order_by(model.id)
+    if params.cursor is not None:
+        stmt = stmt.where(model.id > params.cursor)
+
+    if params.format == "ndjson":
+        return StreamingResponse(_stream_ndjson(stmt), media_type="application/x-ndjson")
+
+    if params.cursor is None and params.limit is None:
+        return StreamingResponse(_stream_json_array(stmt), media_type="application/json")
+
+    # One extra row tells us whether there is a next page
+    limit = params.limit or DEFAULT_PAGE_SIZE
+    result = await session.execute(stmt.limit(limit + 1))
+    rows = [dict(row) for row in result.mappings()]
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1]["id"])
+    return Response(_dumps(rows), media_type="application/json", headers=headers)
+
+
+async def _stream_batches(stmt) -> AsyncIterator[List[Any]]:
+    # Own session: the request's session is closed before the body is streamed
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for batch in result.mappings().partitions():
+            yield batch
+
+
+async def _stream_ndjson(stmt) -> AsyncIterator[bytes]:
+    async for batch in _stream_batches(stmt):
+        yield "".join(_dumps(dict(row)) + "\n" for row in batch).encode("utf-8")
+
+
+async def _stream_json_array(stmt) -> AsyncIterator[bytes]:
+    yield b"["
+    first = True
+    async for batch in _stream_batches(stmt):
+        body = ",".join(_dumps(dict(row)) for row in batch)
+        yield (body if first else "," + body).encode("utf-8")
+        first = False
+    yield b"]"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,16 +1,24 @@
 # backend/app/api/v1/ai.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from app.db.session import get_async_session
-from app.dependencies import get_current_user
+from app.db.session import AsyncSessionLocal, get_async_session
+from app.dependencies import get_current_user, principal_cache
 from app.db.models import Student, InterviewResult, Career, StudentCareerRecommendation
 from app.db.schemas import InterviewResultRead
+from app.db.upsert import dialect_insert, normalize_title, normalized_title
 from app.services.llm import llm_service
-from app.services.career_recommendation import career_recommendation_service
+from app.services.career_recommendation import RECOMMENDATION_DEADLINE, career_recommendation_service
+from app.services.pipeline import StagePipeline, stage_metrics
+from app.services.embedding_cache import embedding_cache
+from app.services.llm_dispatcher import llm_dispatcher
+from app.services.interview_sessions import InterviewSessionConflict, InterviewState, interview_session_store
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import json
+from datetime import datetime
 
 router = APIRouter()
 
@@ -21,8 +29,11 @@ class InterviewResponse(BaseModel):
     questions: List[str]
 
 class SkillAnalysisRequest(BaseModel):
-    interests: str
-    responses: List[str]
+    # Either session_id (plus the answer to the final question), or the full interests and responses
+    session_id: Optional[str] = None
+    response: Optional[str] = None
+    interests: Optional[str] = None
+    responses: List[str] = []
 
 class SkillAnalysisResponse(BaseModel):
     technical_skills: List[str]
@@ -31,8 +42,15 @@ class SkillAnalysisResponse(BaseModel):
     career_interests: List[str]
     confidence_level: str
 
+class AnalyzeAndRecommendResponse(BaseModel):
+    analysis: SkillAnalysisResponse
+    recommended_careers: List[Dict[str, Any]]
+
 class DynamicInterviewRequest(BaseModel):
-    interests: str
+    # With session_id only the new answer is sent; the transcript lives on the server
+    session_id: Optional[str] = None
+    response: Optional[str] = None
+    interests: Optional[str] = None
     previous_questions: List[str] = []
     previous_responses: List[str] = []
     current_question_number: int = 1
@@ -40,6 +58,7 @@ class DynamicInterviewRequest(BaseModel):
 class DynamicInterviewResponse(BaseModel):
     question: str
     is_final_question: bool
+    session_id: Optional[str] = None
 
 class CareerRecommendationRequest(BaseModel):
     interview_analysis: Dict[str, Any]
@@ -68,32 +87,112 @@ async def analyze_interview_responses(
     current_user: Student = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session)
 ):
-    """Analyze interview responses and infer skills."""
+    """Analyze interview responses and infer skills.
+
+    With a session_id the transcript is read from the stored interview.
+    """
+    interests, responses = await _resolve_transcript(request, session, current_user.id)
     try:
-        analysis = await llm_service.infer_skills_from_responses(
-            request.interests,
-            request.responses
-        )
-        
+        analysis = await llm_service.infer_skills_from_responses(interests, responses)
+        # Validate before saving, so a malformed analysis is never stored
+        analysis_response = SkillAnalysisResponse(**analysis)
+
         # Save the result to database
         await llm_service.save_interview_result(session, current_user.id, analysis)
         
-        return SkillAnalysisResponse(**analysis)
+        return analysis_response
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to analyze interview: {str(e)}"
         )
 
+@router.post("/interview/analyze-and-recommend", response_model=AnalyzeAndRecommendResponse)
+async def analyze_and_recommend(
+    request: SkillAnalysisRequest,
+    response: Response,
+    current_user: Student = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Analyze the interview and recommend careers with a single LLM call.
+
+    Same input as /interview/analyze. The analysis and the recommendations
+    are stored together in one transaction after the response is sent.
+    """
+    interests, responses = await _resolve_transcript(request, session, current_user.id)
+    pipeline = StagePipeline("analyze_and_recommend", RECOMMENDATION_DEADLINE)
+    try:
+        analysis, recommended_careers = await pipeline.run(
+            "analyze_and_recommend",
+            career_recommendation_service.analyze_and_recommend(interests, responses)
+        )
+        # Validate before scheduling the store, so a malformed analysis is never persisted
+        result = AnalyzeAndRecommendResponse(
+            analysis=SkillAnalysisResponse(**analysis),
+            recommended_careers=recommended_careers
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Interview analysis took too long, please try again"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze interview: {str(e)}"
+        )
+
+    student_id = current_user.id
+    pipeline.background(
+        "store_results",
+        lambda: _store_analysis_and_recommendations(student_id, analysis, recommended_careers)
+    )
+    response.headers["Server-Timing"] = pipeline.server_timing()
+    return result
+
+async def _store_analysis_and_recommendations(
+    student_id: int,
+    analysis: Dict[str, Any],
+    recommended_careers: List[Dict[str, Any]]
+) -> None:
+    async with AsyncSessionLocal() as store_session:
+        await llm_service.save_interview_result(store_session, student_id, analysis, commit=False)
+        await store_career_recommendations(store_session, student_id, recommended_careers, commit=False)
+        await store_session.commit()
+
+async def _resolve_transcript(request: SkillAnalysisRequest, session: AsyncSession, student_id: int):
+    """Interests and responses from the stored interview session, or from the request body."""
+    if request.session_id:
+        interview = await _get_interview_session(session, request.session_id, student_id)
+        async with interview.lock:
+            if request.response is not None and len(interview.responses) < len(interview.questions):
+                turn = interview.copy()
+                turn.responses.append(request.response)
+                await _save_interview(session, interview, turn)
+        return interview.interests, list(interview.responses)
+    if request.interests is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either session_id or interests is required"
+        )
+    return request.interests, request.responses
+
 @router.post("/interview/dynamic/start", response_model=DynamicInterviewResponse)
 async def start_dynamic_interview(
     request: InterviewRequest,
-    current_user: Student = Depends(get_current_user)
+    current_user: Student = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
 ):
-    """Start a dynamic interview with the first question."""
+    """Start a dynamic interview with the first question.
+
+    Returns a session_id; pass it to /interview/dynamic/next with each answer.
+    """
     try:
         result = await llm_service.generate_initial_question(request.interests)
-        return DynamicInterviewResponse(**result)
+        interview = interview_session_store.create(current_user.id, request.interests)
+        _record_question(interview, result)
+        await _save_interview(session, interview)
+        return DynamicInterviewResponse(**result, session_id=interview.id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -103,9 +202,22 @@ async def start_dynamic_interview(
 @router.post("/interview/dynamic/next", response_model=DynamicInterviewResponse)
 async def get_next_dynamic_question(
     request: DynamicInterviewRequest,
-    current_user: Student = Depends(get_current_user)
+    current_user: Student = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
 ):
-    """Get the next question based on previous responses."""
+    """Get the next question based on previous responses.
+
+    With a session_id the request carries only the new answer. Without one,
+    the client sends the whole transcript as before.
+    """
+    if request.session_id:
+        return await _next_session_question(request, current_user.id, session)
+
+    if request.interests is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either session_id or interests is required"
+        )
     try:
         result = await llm_service.generate_dynamic_question(
             request.interests,
@@ -120,36 +232,185 @@ async def get_next_dynamic_question(
             detail=f"Failed to generate next question: {str(e)}"
         )
 
+async def _next_session_question(
+    request: DynamicInterviewRequest,
+    student_id: int,
+    session: AsyncSession
+) -> DynamicInterviewResponse:
+    interview = await _get_interview_session(session, request.session_id, student_id)
+    if request.response is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="response is required with session_id"
+        )
+
+    # One turn at a time per interview, so a double submit can't interleave answers
+    async with interview.lock:
+        if interview.is_complete:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Interview is already complete"
+            )
+        # Work on a copy; the shared state only changes once the turn is saved
+        turn = interview.copy()
+        turn.responses.append(request.response)
+        try:
+            result = await llm_service.generate_dynamic_question(
+                turn.interests,
+                turn.questions,
+                turn.responses,
+                turn.next_question_number,
+                transcript_summary=turn.summary
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate next question: {str(e)}"
+            )
+        _record_question(turn, result)
+        await _save_interview(session, interview, turn)
+    return DynamicInterviewResponse(**result, session_id=interview.id)
+
+async def _get_interview_session(session: AsyncSession, session_id: str, student_id: int) -> InterviewState:
+    interview = await interview_session_store.get(session, session_id, student_id)
+    if interview is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview session not found"
+        )
+    return interview
+
+def _record_question(interview: InterviewState, result: Dict[str, Any]) -> None:
+    interview.questions.append(result["question"])
+    interview.is_complete = bool(result.get("is_final_question"))
+
+async def _save_interview(
+    session: AsyncSession,
+    interview: InterviewState,
+    turn: Optional[InterviewState] = None
+) -> None:
+    """Write the turn before responding, so any worker can serve the next one."""
+    try:
+        await interview_session_store.save(session, interview, turn)
+    except InterviewSessionConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Interview session was updated by another request; reload and retry"
+        )
+
 @router.post("/career/recommendations", response_model=CareerRecommendationResponse)
 async def get_career_recommendations(
     request: CareerRecommendationRequest,
+    response: Response,
+    mode: str = Query("llm", pattern="^(llm|fast)$", description="llm ranks with Gemini; fast ranks locally without the LLM"),
     current_user: Student = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session)
 ):
-    """Get career recommendations based on interview analysis."""
+    """Get career recommendations based on interview analysis.
+
+    Saving the interview and computing recommendations run concurrently
+    under RECOMMENDATION_DEADLINE; storing the recommendations happens in
+    the background after the response. Stage timings are returned in the
+    Server-Timing header.
+    """
+    pipeline = StagePipeline("career_recommendations", RECOMMENDATION_DEADLINE)
     try:
-        # Save interview results to database
-        await llm_service.save_interview_result(
-            session, 
-            current_user.id, 
-            request.interview_analysis
+        results = await pipeline.gather(
+            save_interview=llm_service.save_interview_result(
+                session,
+                current_user.id,
+                request.interview_analysis
+            ),
+            recommend=career_recommendation_service.get_career_recommendations(
+                request.interview_analysis,
+                mode=mode
+            )
         )
-        
-        # Get career recommendations
-        recommended_careers = await career_recommendation_service.get_career_recommendations(
+        recommended_careers = results["recommend"]
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Career recommendations took too long, please try again"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get career recommendations: {str(e)}"
+        )
+
+    student_id = current_user.id
+    pipeline.background(
+        "store_recommendations",
+        lambda: _store_recommendations_in_new_session(student_id, recommended_careers)
+    )
+    response.headers["Server-Timing"] = pipeline.server_timing()
+    return CareerRecommendationResponse(recommended_careers=recommended_careers)
+
+async def _store_recommendations_in_new_session(student_id: int, recommended_careers: List[Dict[str, Any]]) -> None:
+    # Runs after the request session is released
+    async with AsyncSessionLocal() as store_session:
+        await store_career_recommendations(store_session, student_id, recommended_careers)
+
+@router.post("/career/recommendations/stream")
+async def stream_career_recommendations(
+    request: CareerRecommendationRequest,
+    current_user: Student = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Stream career recommendations as server-sent events.
+
+    Emits a `career` event per recommendation as soon as the LLM finishes it,
+    then a `done` event with the full list once it has been stored.
+    """
+    try:
+        await llm_service.save_interview_result(
+            session,
+            current_user.id,
             request.interview_analysis
         )
-        
-        # Store career recommendations in the database (idempotent upsert)
-        await store_career_recommendations(session, current_user.id, recommended_careers)
-        
-        return CareerRecommendationResponse(recommended_careers=recommended_careers)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get career recommendations: {str(e)}"
         )
 
+    student_id = current_user.id
+
+    async def event_stream():
+        recommended_careers = []
+        try:
+            async for career in career_recommendation_service.stream_career_recommendations(request.interview_analysis):
+                recommended_careers.append(career)
+                yield _sse_event("career", career)
+
+            # The request session may already be released while streaming
+            await _store_recommendations_in_new_session(student_id, recommended_careers)
+            yield _sse_event("done", {"recommended_careers": recommended_careers})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Failed to get career recommendations: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.get("/metrics")
+async def get_ai_metrics(current_user: Student = Depends(get_current_user)):
+    """Cache and performance counters for the AI endpoints."""
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "recommendation_cache": career_recommendation_service.cache_stats(),
+        "llm_response_cache": llm_service.cache_stats(),
+        "interview_sessions": interview_session_store.stats(),
+        "llm_dispatcher": llm_dispatcher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "stages": stage_metrics.stats()
+    }
+
 @router.get("/interview/result", response_model=InterviewResultRead)
 async def get_interview_result(
     current_user: Student = Depends(get_current_user),
@@ -192,64 +453,121 @@ async def get_interview_result(
 async def store_career_recommendations(
     session: AsyncSession, 
     student_id: int, 
-    recommended_careers: List[Dict[str, Any]]
+    recommended_careers: List[Dict[str, Any]],
+    commit: bool = True
 ):
     """Store career recommendations in the database and link to the student.
 
     This ensures stable, repeatable recommendations by caching them per student.
+    Runs a fixed number of statements however many careers there are: careers
+    are resolved and created in bulk, links are upserted in one statement and
+    only links to careers no longer recommended are deleted.
+    With commit=False the caller commits, e.g. together with the interview result.
     """
     try:
-        # First, clear any existing recommendations for this student to override old ones
-        await session.execute(
-            delete(StudentCareerRecommendation).where(
-                StudentCareerRecommendation.student_id == student_id
-            )
-        )
-        await session.flush()
-
+        # One entry per normalized title; the first (best-ranked) one wins
+        careers_by_title: Dict[str, Dict[str, Any]] = {}
         for career_data in recommended_careers:
             career_title = career_data.get('title', '') or ''
             # Skip invalid entries without a valid title
             if not isinstance(career_title, str) or not career_title.strip():
                 continue
-            career_description = career_data.get('description', '') or ''
-            required_skills = career_data.get('required_skills', []) or []
-            programs = career_data.get('programs', []) or []
-            match_reason = career_data.get('match_reason', '') or ''
-            confidence_score = career_data.get('confidence_score', 0.0) or 0.0
-            learning_path = career_data.get('learning_path', '') or ''
-
-            # Find or create Career by exact title
-            career_stmt = select(Career).where(Career.title == career_title)
-            career_result = await session.execute(career_stmt)
-            career = career_result.scalar_one_or_none()
-
-            if not career:
-                career = Career(
-                    title=career_title,
-                    description=career_description,
-                    required_skills=required_skills if isinstance(required_skills, list) else [required_skills] if required_skills else [],
-                    programs=programs if isinstance(programs, list) else []
-                )
-                session.add(career)
-                # Ensure career.id is available for FK references
-                await session.flush()
-                await session.flush()
-
-            # Create StudentCareerRecommendation link
-            rec = StudentCareerRecommendation(
-                student_id=student_id,
-                career_id=career.id,
-                match_reason=match_reason,
-                confidence_score=confidence_score,
-                learning_path=learning_path,
+            careers_by_title.setdefault(normalize_title(career_title), career_data)
+
+        career_ids = await _resolve_career_ids(session, careers_by_title)
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "student_id": student_id,
+                "career_id": career_ids[title],
+                "match_reason": career_data.get('match_reason', '') or '',
+                "confidence_score": career_data.get('confidence_score', 0.0) or 0.0,
+                "learning_path": career_data.get('learning_path', '') or '',
+                "created_at": now,
+                "updated_at": now,
+            }
+            for title, career_data in careers_by_title.items()
+            if title in career_ids
+        ]
+        if rows:
+            upsert = dialect_insert(session, StudentCareerRecommendation).values(rows)
+            # Conflict target is uq_student_career_recommendation
+            upsert = upsert.on_conflict_do_update(
+                index_elements=["student_id", "career_id"],
+                set_={
+                    "match_reason": upsert.excluded.match_reason,
+                    "confidence_score": upsert.excluded.confidence_score,
+                    "learning_path": upsert.excluded.learning_path,
+                    "updated_at": upsert.excluded.updated_at,
+                }
+            )
+            await session.execute(upsert)
+
+        # Drop links to careers that are no longer recommended
+        await session.execute(
+            delete(StudentCareerRecommendation).where(
+                StudentCareerRecommendation.student_id == student_id,
+                StudentCareerRecommendation.career_id.not_in([row["career_id"] for row in rows])
             )
-            session.add(rec)
+        )
 
-        await session.commit()
-        print(f"Successfully stored/updated {len(recommended_careers)} career recommendations for student {student_id}")
+        if commit:
+            await session.commit()
+        else:
+            await session.flush()
+        print(f"Successfully stored/updated {len(rows)} career recommendations for student {student_id}")
         
     except Exception as e:
         await session.rollback()
         print(f"Error storing career recommendations: {str(e)}")
         raise
+
+async def _resolve_career_ids(
+    session: AsyncSession,
+    careers_by_title: Dict[str, Dict[str, Any]]
+) -> Dict[str, int]:
+    """Map normalized titles to career ids, creating the careers that don't exist yet."""
+    if not careers_by_title:
+        return {}
+    title_key = normalized_title(Career.title)
+    result = await session.execute(
+        select(title_key, Career.id).where(title_key.in_(list(careers_by_title)))
+    )
+    career_ids = {title: career_id for title, career_id in result.all()}
+
+    missing = [
+        {
+            "title": career_data['title'].strip(),
+            "description": career_data.get('description', '') or '',
+            "required_skills": _as_list(career_data.get('required_skills')),
+            "programs": career_data['programs'] if isinstance(career_data.get('programs'), list) else [],
+            "created_at": datetime.utcnow(),
+        }
+        for title, career_data in careers_by_title.items()
+        if title not in career_ids
+    ]
+    if not missing:
+        return career_ids
+
+    insert_stmt = (
+        dialect_insert(session, Career)
+        .values(missing)
+        .on_conflict_do_nothing()
+        .returning(Career.id, Career.title)
+    )
+    result = await session.execute(insert_stmt)
+    for career_id, career_title in result.all():
+        career_ids[normalize_title(career_title)] = career_id
+
+    # Titles another request created between our SELECT and INSERT
+    raced = [title for title in careers_by_title if title not in career_ids]
+    if raced:
+        result = await session.execute(select(title_key, Career.id).where(title_key.in_(raced)))
+        career_ids.update({title: career_id for title, career_id in result.all()})
+    return career_ids
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, list):
+        return value
+    return [value] if value else []
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
 from typing import List
 from app.db.session import get_async_session
 from app.db.models import Career, Student, StudentCareerRecommendation
 from app.db.schemas import CareerCreate, CareerRead, CareerUpdate
 from app.dependencies import get_current_user
+from app.api.listing import ListParams, list_rows
+from app.services.catalog import career_catalog
 
 router = APIRouter()
 
@@ -15,10 +18,19 @@ async def create_career(career: CareerCreate, session: AsyncSession = Depends(ge
     career_data = career.model_dump()
     db_career = Career(**career_data)
     session.add(db_career)
-    await session.commit()
+    await _commit_career(session)
     await session.refresh(db_career)
+    career_catalog.upsert(db_career)
     return db_career
 
+async def _commit_career(session: AsyncSession) -> None:
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        # uq_careers_normalized_title: titles are unique ignoring case and spaces
+        raise HTTPException(status_code=409, detail="A career with this title already exists")
+
 @router.get("/{career_id}", response_model=CareerRead)
 async def get_career(career_id: int, session: AsyncSession = Depends(get_async_session)):
     career = await session.get(Career, career_id)
@@ -26,11 +38,13 @@ async def get_career(career_id: int, session: AsyncSession = Depends(get_async_s
         raise HTTPException(status_code=404, detail="Career not found")
     return career
 
-@router.get("/", response_model=List[CareerRead])
-async def list_careers(session: AsyncSession = Depends(get_async_session)):
-    result = await session.execute(select(Career))
-    careers = result.scalars().all()
-    return careers
+@router.get("/", response_class=Response)
+async def list_careers(
+    params: ListParams = Depends(),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """List all careers, or a page at a time with cursor/limit (or streamed as NDJSON)."""
+    return await list_rows(session, Career, params, list(CareerRead.model_fields))
 
 @router.patch("/{career_id}", response_model=CareerRead)
 async def update_career(career_id: int, update_data: CareerUpdate, session: AsyncSession = Depends(get_async_session)):
@@ -43,9 +57,12 @@ async def update_career(career_id: int, update_data: CareerUpdate, session: Asyn
     update_dict = update_data.model_dump(exclude_unset=True)
     for field, value in update_dict.items():
         setattr(career, field, value)
+    # No longer matches the ingested record, so the next ingest restores it
+    career.content_hash = None
     
-    await session.commit()
+    await _commit_career(session)
     await session.refresh(career)
+    career_catalog.upsert(career)
     return career
 
 @router.get("/recommended/me", response_model=List[CareerRead])
@@ -71,4 +88,5 @@ async def delete_career(career_id: int, session: AsyncSession = Depends(get_asyn
     
     await session.delete(career)
     await session.commit()
+    career_catalog.remove(career_id)
     return None
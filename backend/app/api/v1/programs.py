@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Dict, Any
 from app.db.session import get_async_session
-from app.db.models import Career, Program
+from app.db.models import Program
+from app.services.catalog import career_catalog
+from app.services.program_catalog import program_catalog
 
 router = APIRouter()
 
@@ -20,27 +22,20 @@ async def get_programs_info():
     }
 
 @router.get("/all")
-async def get_all_programs_from_careers(session: AsyncSession = Depends(get_async_session)):
-    """Get all programs from all careers (flattened view)."""
-    result = await session.execute(select(Career))
-    careers = result.scalars().all()
-    
-    all_programs = []
-    for career in careers:
-        if career.programs:  # If career has programs JSON
-            for program in career.programs:
-                program_with_career = {
-                    **program,
-                    "career_id": career.id,
-                    "career_title": career.title
-                }
-                all_programs.append(program_with_career)
-    
-    return {
-        "programs": all_programs,
-        "total_count": len(all_programs),
-        "message": "Programs extracted from all careers"
-    }
+async def get_all_programs_from_careers(request: Request, session: AsyncSession = Depends(get_async_session)):
+    """Get all programs from all careers (flattened view).
+
+    Served from the pre-serialized program catalog, which the /careers
+    endpoints keep current.
+    """
+    if not program_catalog.loaded:
+        # Startup could not load the catalog; load it now
+        await career_catalog.load(session)
+    body, version, etag = program_catalog.payload()
+    headers = {"ETag": etag, "X-Catalog-Version": str(version)}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.get("/{program_name}")
@@ -1,24 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.db.schemas import StudentRead
 from app.db.models import Student
-from app.dependencies import get_current_user
+from app.dependencies import StudentSnapshot, get_current_user, principal_cache
+from app.api.listing import ListParams, list_rows
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import update
 from app.db.session import get_async_session
-from typing import List
 from sqlalchemy import select
 
 router = APIRouter()
 
 @router.get("/me", response_model=StudentRead)
-async def get_my_profile(current_user: Student = Depends(get_current_user)):
+async def get_my_profile(current_user: StudentSnapshot = Depends(get_current_user)):
     """Get the current authenticated student's profile."""
     return current_user
 
 @router.patch("/me", response_model=StudentRead)
 async def update_my_profile(
     update_data: dict,
-    current_user: Student = Depends(get_current_user),
+    current_user: StudentSnapshot = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Update the current authenticated student's profile."""
@@ -37,9 +37,10 @@ async def update_my_profile(
     )
     await session.execute(stmt)
     await session.commit()
-    # Refresh and return updated user
-    await session.refresh(current_user)
-    return current_user
+    # The cached snapshot is now stale
+    principal_cache.invalidate(current_user.id)
+    # Return the updated user
+    return await session.get(Student, current_user.id)
 
 @router.get("/{student_id}", response_model=StudentRead)
 async def get_student_by_id(student_id: int, session: AsyncSession = Depends(get_async_session)):
@@ -49,16 +50,17 @@ async def get_student_by_id(student_id: int, session: AsyncSession = Depends(get
         raise HTTPException(status_code=404, detail="Student not found")
     return student
 
-@router.get("/", response_model=List[StudentRead])
-async def list_students(session: AsyncSession = Depends(get_async_session)):
-    """List all students (admin/future use)."""
-    result = await session.execute(select(Student))
-    students = result.scalars().all()
-    return students
+@router.get("/", response_class=Response)
+async def list_students(
+    params: ListParams = Depends(),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """List all students, or a page at a time with cursor/limit (admin/future use)."""
+    return await list_rows(session, Student, params, list(StudentRead.model_fields))
 
 @router.get("/me/info")
 async def get_my_info(
-    current_user: Student = Depends(get_current_user)
+    current_user: StudentSnapshot = Depends(get_current_user)
 ):
     """Get additional info about the current student in the simplified system."""
     return {
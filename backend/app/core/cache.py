@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss/eviction counters.
+
+    With a ttl (seconds), entries older than the ttl are treated as misses and
+    dropped on access.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._expires: Dict[Hashable, float] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING and self._expires.get(key, float("inf")) <= time.monotonic():
+                del self._data[key]
+                del self._expires[key]
+                self.expirations += 1
+                value = _MISSING
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if ttl is not None:
+                self._expires[key] = time.monotonic() + ttl
+            else:
+                self._expires.pop(key, None)
+            while len(self._data) > self.max_size:
+                evicted, _ = self._data.popitem(last=False)
+                self._expires.pop(evicted, None)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._expires.pop(key, None)
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight computation.
+
+    The computation runs as its own task and every caller, the first one
+    included, awaits it through a shield. A caller that is cancelled (client
+    disconnect, deadline) only stops waiting; the others still get the result.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, "asyncio.Task"] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark retrieved so an error nobody is waiting for isn't logged as unhandled
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
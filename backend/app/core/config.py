@@ -1,8 +1,29 @@
 import os
+from dotenv import load_dotenv
+
+load_dotenv()
 
 class Settings:
     PROJECT_NAME: str = "Career Compass Backend"
     API_V1_STR: str = "/api/v1"
+    # Vector search backend for career retrieval: "pinecone", "local", or "fake"
+    # (the local index behind the Pinecone client path, with simulated latency)
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+    # Per-call timeout (seconds) and concurrency cap for remote vector queries
+    VECTOR_QUERY_TIMEOUT: float = float(os.getenv("VECTOR_QUERY_TIMEOUT", "2.0"))
+    VECTOR_MAX_CONCURRENCY: int = int(os.getenv("VECTOR_MAX_CONCURRENCY", "8"))
+    # Timeout (seconds) for building the Pinecone client, and how long a failed build is remembered
+    VECTOR_CONNECT_TIMEOUT: float = float(os.getenv("VECTOR_CONNECT_TIMEOUT", "5.0"))
+    VECTOR_CONNECT_BACKOFF: float = float(os.getenv("VECTOR_CONNECT_BACKOFF", "30"))
+    CAREER_CATALOG_PATH: str = os.getenv("CAREER_CATALOG_PATH", "app/db/career.json")
+    # Memory-mapped career embeddings written by the catalog ingest scripts
+    EMBEDDING_STORE_PATH: str = os.getenv("EMBEDDING_STORE_PATH", "app/db/career_embeddings.bin")
+    # LLM provider: "gemini", "fake" (offline canned replies), "record" or "replay" (cassette files)
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "gemini").lower()
+    LLM_CASSETTE_DIR: str = os.getenv("LLM_CASSETTE_DIR", "cassettes")
+    # Latency distributions for the fakes, e.g. "fixed:0.5", "uniform:0.2:1.5", "lognormal:-0.4:0.5"
+    FAKE_LLM_LATENCY: str = os.getenv("FAKE_LLM_LATENCY", "uniform:0.5:1.5")
+    FAKE_VECTOR_LATENCY: str = os.getenv("FAKE_VECTOR_LATENCY", "uniform:0.02:0.08")
     # Add more settings as needed
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings() 
@@ -39,13 +39,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify and decode a JWT token, return the subject (user_id)."""
+def decode_access_token(token: str) -> Optional[dict]:
+    """Verify a JWT token and return its claims, or None if it is invalid or expired."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        return user_id
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        return None 
\ No newline at end of file
+        return None
+
+def verify_token(token: str) -> Optional[str]:
+    """Verify and decode a JWT token, return the subject (user_id)."""
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    return user_id
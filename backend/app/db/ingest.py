@@ -0,0 +1,199 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Career, Program
+from app.db.upsert import dialect_insert, normalize_title, normalized_title
+from app.services.stream_json import JSONArrayStreamParser
+
+# Bytes read from the JSON file per parser feed
+READ_CHUNK_SIZE = 64 * 1024
+# Rows per multi-row INSERT ... ON CONFLICT DO UPDATE
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass
+class IngestReport:
+    table: str
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    errors: int = 0  # Array items that aren't JSON objects
+    seconds: float = 0.0
+
+    @property
+    def records(self) -> int:
+        return self.inserted + self.updated + self.unchanged + self.skipped + self.errors
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+@dataclass(frozen=True)
+class CatalogTable:
+    """How records from one JSON catalog map onto rows of one table."""
+
+    name: str
+    model: Any
+    key_column: Any  # SQL expression the unique index is on
+    conflict_target: List[Any]
+    to_row: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    row_key: Callable[[Dict[str, Any]], str]
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Stable hash of a row's stored values."""
+    payload = json.dumps(row, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_json_array(path: str, read_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array without loading the whole file.
+
+    Raises ValueError if the file isn't a JSON array or ends before it closes.
+    """
+    parser = JSONArrayStreamParser(strict=True)
+    with open(path, "r", encoding="utf-8") as f:
+        while not parser.done:
+            chunk = f.read(read_size)
+            if not chunk:
+                raise ValueError(f"{path} is not a complete JSON array")
+            yield from parser.feed(chunk)
+
+
+def career_row(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    title = item.get("title")
+    if not isinstance(title, str) or not title.strip():
+        return None
+    required_skills = item.get("required_skills") or []
+    programs = item.get("programs") or []
+    return {
+        "title": title.strip(),
+        "description": item.get("description"),
+        "required_skills": required_skills if isinstance(required_skills, list) else [required_skills],
+        "programs": programs if isinstance(programs, list) else [],
+    }
+
+
+def program_row(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    name = item.get("program")
+    if not isinstance(name, str) or not name.strip():
+        return None
+    universities = item.get("universities", [])
+    # Only store the universities array under 'universities' key
+    return {"name": name, "data": {"universities": universities if isinstance(universities, list) else []}}
+
+
+CAREERS = CatalogTable(
+    name="careers",
+    model=Career,
+    key_column=normalized_title(Career.title),
+    conflict_target=[normalized_title(Career.title)],  # uq_careers_normalized_title
+    to_row=career_row,
+    row_key=lambda row: normalize_title(row["title"]),
+)
+
+PROGRAMS = CatalogTable(
+    name="programs",
+    model=Program,
+    key_column=Program.name,
+    conflict_target=[Program.name],
+    to_row=program_row,
+    row_key=lambda row: row["name"],
+)
+
+
+async def ingest_catalog(
+    session: AsyncSession,
+    table: CatalogTable,
+    json_file: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    commit: bool = True
+) -> IngestReport:
+    """Load a JSON catalog into `table`, writing only records whose content changed.
+
+    Stored content hashes are read in one query. The file is stream-parsed
+    twice: the first pass keeps only key -> hash of each key's last record,
+    so later duplicates win wherever they fall; the second writes new or
+    changed records with chunked multi-row INSERT ... ON CONFLICT DO UPDATE
+    statements in a single transaction. An unchanged catalog costs one SELECT.
+    """
+    started = time.perf_counter()
+    report = IngestReport(table.name)
+    result = await session.execute(select(table.key_column, table.model.content_hash))
+    stored: Dict[str, Optional[str]] = {key: stored_hash for key, stored_hash in result.all()}
+
+    latest: Dict[str, str] = {}
+    for is_object, row in _iter_rows(table, json_file):
+        if not is_object:
+            report.errors += 1
+            continue
+        if row is None:
+            report.skipped += 1
+            continue
+        key = table.row_key(row)
+        if key in latest:
+            # Duplicate key within the file; the later record wins
+            report.skipped += 1
+        latest[key] = row["content_hash"]
+    to_write = {key for key, row_hash in latest.items() if stored.get(key) != row_hash}
+
+    pending: List[Dict[str, Any]] = []
+    written = 0
+    try:
+        if to_write:
+            for _, row in _iter_rows(table, json_file):
+                if row is None:
+                    continue
+                key = table.row_key(row)
+                if key not in to_write or row["content_hash"] != latest[key]:
+                    continue
+                # Write each key once, from its last record
+                to_write.discard(key)
+                pending.append(row)
+                if len(pending) >= chunk_size:
+                    await _upsert(session, table, pending)
+                    written += len(pending)
+                    pending = []
+
+        if pending:
+            await _upsert(session, table, pending)
+            written += len(pending)
+        if commit:
+            await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    report.inserted = sum(1 for key in latest if key not in stored)
+    report.updated = written - report.inserted
+    report.unchanged = len(latest) - written
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _iter_rows(table: CatalogTable, json_file: str) -> Iterator[Tuple[bool, Optional[Dict[str, Any]]]]:
+    """(is the item an object, its row with content hash or None if it can't be stored) per array item."""
+    for item in iter_json_array(json_file):
+        if not isinstance(item, dict):
+            yield False, None
+            continue
+        row = table.to_row(item)
+        if row is not None:
+            row["content_hash"] = content_hash(row)
+        yield True, row
+
+
+async def _upsert(session: AsyncSession, table: CatalogTable, rows: List[Dict[str, Any]]) -> None:
+    stmt = dialect_insert(session, table.model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=table.conflict_target,
+        set_={column: getattr(stmt.excluded, column) for column in rows[0]}
+    )
+    await session.execute(stmt)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float, UniqueConstraint, Boolean, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -24,8 +24,14 @@ class Career(Base):
     description = Column(Text, nullable=True)
     required_skills = Column(JSON, nullable=True)  # JSON array of skills
     programs = Column(JSON, nullable=True)  # JSON array of programs
+    content_hash = Column(String(64), nullable=True)  # Set by ingest_catalog.py to skip unchanged records
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # One career per title, ignoring case and surrounding spaces
+        Index("uq_careers_normalized_title", func.lower(func.trim(title)), unique=True),
+    )
+
 
 class InterviewResult(Base):
     __tablename__ = "interview_results"
@@ -41,6 +47,21 @@ class InterviewResult(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class InterviewSession(Base):
+    __tablename__ = "interview_sessions"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex, handed to the client
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
+    interests = Column(Text, nullable=False)
+    questions = Column(JSON, nullable=False)  # JSON array of questions asked so far
+    responses = Column(JSON, nullable=False)  # JSON array of the student's answers
+    transcript_summary = Column(JSON, nullable=True)  # Running summary of turns no longer sent verbatim
+    is_complete = Column(Boolean, default=False, nullable=False)
+    version = Column(Integer, default=0, nullable=False)  # Bumped on every write; checked to reject stale copies
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class StudentCareerRecommendation(Base):
     __tablename__ = "student_career_recommendations"
 
@@ -73,4 +94,5 @@ class Program(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(256), unique=True, nullable=False, index=True)
     data = Column(JSON, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # Set by ingest_catalog.py to skip unchanged records
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,24 @@
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def normalize_title(title: str) -> str:
+    """Python side of the lower(trim(title)) expression behind a unique title index."""
+    return title.strip().lower()
+
+
+def normalized_title(column: Any):
+    return func.lower(func.trim(column))
+
+
+def dialect_insert(session: AsyncSession, table: Any):
+    """INSERT construct with ON CONFLICT / RETURNING support for the session's database."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Bulk upserts are not supported on {dialect}")
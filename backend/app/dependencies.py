@@ -1,44 +1,141 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.db.session import get_async_session
+from app.db.session import AsyncSessionLocal
 from app.db.models import Student
-from app.core.security import verify_token
+from app.core.cache import LRUCache, SingleFlight
+from app.core.security import decode_access_token
 
 security = HTTPBearer()
 
+PRINCIPAL_TOKEN_CACHE_SIZE = int(os.getenv("PRINCIPAL_TOKEN_CACHE_SIZE", "4096"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+# Upper bound on how stale a profile seen by another worker can be
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+
+@dataclass(frozen=True)
+class StudentSnapshot:
+    """Read-only copy of the Student columns handlers need, safe to share across requests."""
+
+    id: int
+    roll_number: Optional[str]
+    first_name: str
+    last_name: str
+    email: str
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, student: Student) -> "StudentSnapshot":
+        return cls(
+            id=student.id,
+            roll_number=student.roll_number,
+            first_name=student.first_name,
+            last_name=student.last_name,
+            email=student.email,
+            created_at=student.created_at,
+        )
+
+
+class PrincipalCache:
+    """Caches for authentication: token -> claims and user id -> StudentSnapshot.
+
+    Claims are kept until the token expires, snapshots for `ttl` seconds or
+    until `invalidate` is called after the student's row changes. A warm
+    request authenticates without decoding the JWT or touching the database.
+    """
+
+    def __init__(
+        self,
+        token_cache_size: int = PRINCIPAL_TOKEN_CACHE_SIZE,
+        max_size: int = PRINCIPAL_CACHE_SIZE,
+        ttl: float = PRINCIPAL_CACHE_TTL
+    ):
+        self.tokens = LRUCache(token_cache_size)
+        self.students = LRUCache(max_size, ttl=ttl)
+        self._in_flight = SingleFlight()
+        self.db_lookups = 0
+
+    def claims(self, token: str) -> Optional[Dict[str, Any]]:
+        claims = self.tokens.get(token)
+        if claims is None:
+            claims = decode_access_token(token)
+            if claims is None:
+                return None
+            # Never serve a token past its exp claim
+            expires_in = claims["exp"] - time.time() if "exp" in claims else None
+            self.tokens.set(token, claims, ttl=expires_in)
+        elif "exp" in claims and claims["exp"] <= time.time():
+            self.tokens.pop(token)
+            return None
+        return claims
+
+    async def student(self, user_id: int) -> Optional[StudentSnapshot]:
+        snapshot = self.students.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        async def load() -> Optional[StudentSnapshot]:
+            self.db_lookups += 1
+            # Own session: the load is shared and can outlive the request that started it
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(select(Student).where(Student.id == user_id))
+                user = result.scalar_one_or_none()
+                if user is None:
+                    return None
+                loaded = StudentSnapshot.from_model(user)
+            self.students.set(user_id, loaded)
+            return loaded
+
+        return await self._in_flight.do(user_id, load)
+
+    def invalidate(self, user_id: int) -> None:
+        self.students.pop(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": self.tokens.stats(),
+            "students": self.students.stats(),
+            "db_lookups": self.db_lookups,
+            "single_flight": self._in_flight.stats(),
+        }
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_async_session)
-) -> Student:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> StudentSnapshot:
     """Get the current authenticated user from JWT token."""
-    token = credentials.credentials
-    user_id = verify_token(token)
-    
+    claims = principal_cache.claims(credentials.credentials)
+    user_id = claims.get("sub") if claims else None
+
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Get user from database
-    result = await session.execute(
-        select(Student).where(Student.id == int(user_id))
-    )
-    user = result.scalar_one_or_none()
-    
+
+    # Get user from the cache, falling back to the database
+    user = await principal_cache.student(int(user_id))
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user 
 
-def admin_required(current_user: Student = Depends(get_current_user)) -> Student:
+    return user
+
+def admin_required(current_user: StudentSnapshot = Depends(get_current_user)) -> StudentSnapshot:
     if getattr(current_user, "role", None) != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
-    return current_user
\ No newline at end of file
+    return current_user
+
+# Global instance
+principal_cache = PrincipalCache()
@@ -3,7 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import create_async_engine
 from app.db.models import Base
-from app.db.session import DATABASE_URL
+from app.db.session import DATABASE_URL, AsyncSessionLocal
+from app.services.catalog import career_catalog
+from app.services.career_recommendation import career_recommendation_service
+from app.services.pipeline import drain_background_tasks
 import asyncio
 
 app = FastAPI(title="Career Compass API", version="1.0.0")
@@ -37,13 +40,32 @@ async def create_tables():
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
 
+async def load_career_catalog():
+    """Load the careers table into memory for the retrieval indexes."""
+    try:
+        async with AsyncSessionLocal() as session:
+            await career_catalog.load(session)
+        print(f"✅ Loaded {len(career_catalog)} careers into the in-memory catalog")
+    except Exception as e:
+        print(f"❌ Error loading career catalog: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     """Run startup tasks."""
     print("🚀 Starting Career Compass Backend API...")
     await create_tables()
+    await load_career_catalog()
+    career_recommendation_service.warm_up()
+    await career_recommendation_service.connect_vector_store()
     print("✅ Backend startup completed successfully!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release clients opened at startup."""
+    await career_recommendation_service.close()
+    # Finish background persistence
+    await drain_background_tasks()
+
 # Import and include routers
 from app.api.v1 import auth
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
@@ -3,7 +3,7 @@ from dotenv import load_dotenv
 import os
 
 
-def connect_pinecone(index_name: str):
+def _get_client() -> Pinecone:
     # Load environment variables from .env
     load_dotenv()
     PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
@@ -12,9 +12,12 @@ def connect_pinecone(index_name: str):
         raise ValueError("PINECONE_API_KEY not found in environment variables.")
 
     # Initialize the Pinecone client
-    pc = Pinecone(api_key=PINECONE_API_KEY)
+    return Pinecone(api_key=PINECONE_API_KEY)
+
 
-    # Create the index if it doesn't already exist
+def ensure_index(index_name: str, pc: Pinecone = None) -> Pinecone:
+    """Create the index if it doesn't already exist. Call once at startup."""
+    pc = pc or _get_client()
     existing_indexes = [index["name"] for index in pc.list_indexes()]
     if index_name not in existing_indexes:
         pc.create_index(
@@ -26,6 +29,29 @@ def connect_pinecone(index_name: str):
                 region="us-east-1"
             )
         )
+    return pc
+
+
+def connect_pinecone(index_name: str):
+    """Ensure the index exists and return a synchronous index handle."""
+    pc = ensure_index(index_name)
 
     # Return the index object
     return pc.Index(index_name)
+
+
+def get_index(index_name: str):
+    """Return a synchronous index handle without checking that it exists."""
+    return _get_client().Index(index_name)
+
+
+def get_async_index_host(index_name: str):
+    """Return (client, host) for a native asyncio index handle, or None if the SDK doesn't have one.
+
+    Blocking: run it in a thread, then call client.IndexAsyncio(host=host) on
+    the event loop, which its aiohttp session needs.
+    """
+    pc = _get_client()
+    if not hasattr(pc, "IndexAsyncio"):
+        return None
+    return pc, pc.describe_index(index_name).host
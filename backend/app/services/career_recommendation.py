@@ -1,242 +1,536 @@
 import os
 import json
-from typing import List, Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import ChatPromptTemplate
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from dotenv import load_dotenv
-from app.pinecone.pineconeSetup import connect_pinecone
+from app.pinecone.pineconeSetup import ensure_index, get_async_index_host, get_index
+from app.core.config import settings
+from app.core.cache import LRUCache, SingleFlight
+from app.services.embeddings import analysis_to_text, embed_text
+from app.services.embedding_cache import analysis_fingerprint, embedding_cache
+from app.services.vector_search import LocalVectorIndex, careers_to_vectors, load_career_index
+from app.services.vector_store import AsyncVectorStore
+from app.services.fast_ranking import rank_careers_fast
+from app.services.catalog import CatalogListener, career_catalog
+from app.services.catalog_sync import sync_local_index
+from app.services.embedding_store import open_embedding_store
+from app.services.keyword_search import bm25_index, reciprocal_rank_fusion
+from app.services.skills import skill_index
+from app.services.transcript import ANALYSIS_DEFAULTS, extract_skills, normalize_analysis
+from app.services.stream_json import JSONArrayStreamParser
+from app.services.providers import FakeVectorIndex
+from app.services.prompts import get_chain, parse_json_response
+from app.services.llm_dispatcher import Priority, llm_dispatcher
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+PINECONE_INDEX_NAME = "career-compass"
+# Candidates pulled from each retriever before fusion
+RETRIEVAL_DEPTH = 20
+# Fused candidates sent to the LLM for final ranking
+LLM_CANDIDATE_COUNT = int(os.getenv("LLM_CANDIDATE_COUNT", "6"))
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "1024"))
+RECOMMENDATION_CACHE_TTL = float(os.getenv("RECOMMENDATION_CACHE_TTL", "3600"))
+# Seconds to wait for the LLM ranking before serving the fast local ranking
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+# Overall budget (seconds) for one /career/recommendations request
+RECOMMENDATION_DEADLINE = float(os.getenv("RECOMMENDATION_DEADLINE", "30"))
+# Candidates ranked locally in fast mode
+FAST_CANDIDATE_COUNT = 15
+
+
+# Fields of an interview analysis, used when the LLM omits one
+def transcript_to_analysis(interests: str, responses: List[str]) -> Dict[str, Any]:
+    """Provisional analysis from raw interview text, for retrieval before the LLM has run."""
+    return {
+        **ANALYSIS_DEFAULTS,
+        "technical_skills": extract_skills(" ".join([interests, *responses])),
+        "career_interests": [interests] if interests else []
+    }
+
+
+class _CatalogCacheInvalidator(CatalogListener):
+    """Drops cached candidates and recommendations whenever the career catalog changes."""
+
+    def __init__(self, service: "CareerRecommendationService"):
+        self.service = service
+
+    def on_change(self) -> None:
+        embedding_cache.clear_candidates()
+        self.service.recommendation_cache.clear()
+
+
+class _LocalIndexSync(CatalogListener):
+    """Applies career creates, edits and deletes to the in-process vector index once it is loaded."""
+
+    def __init__(self, service: "CareerRecommendationService"):
+        self.service = service
+        self._keys: Dict[int, str] = {}  # career id -> vector id
+
+    def rebuild(self, careers: List[Dict[str, Any]]) -> None:
+        self._keys = {career["id"]: career["key"] for career in careers}
+        index = self.service._local_index
+        if index is not None:
+            sync_local_index(index, careers)
+
+    def upsert(self, career: Dict[str, Any]) -> None:
+        previous_key = self._keys.get(career["id"])
+        self._keys[career["id"]] = career["key"]
+        index = self.service._local_index
+        if index is None:
+            return
+        if previous_key and previous_key != career["key"] and previous_key not in self._keys.values():
+            # Renamed: the vector id is derived from the title
+            index.delete([previous_key])
+        index.upsert(careers_to_vectors([career]))
+
+    def remove(self, career_id: int) -> None:
+        key = self._keys.pop(career_id, None)
+        index = self.service._local_index
+        if index is not None and key and key not in self._keys.values():
+            index.delete([key])
+
+
 class CareerRecommendationService:
     def __init__(self):
-        self._llm = None
         self._pinecone_index = None
+        self._vector_store = None
+        self._local_index = None
+        # A failed Pinecone connect is remembered until this monotonic time
+        self._connect_retry_at = 0.0
+        self._connect_error = ""
+        self.recommendation_cache = LRUCache(RECOMMENDATION_CACHE_SIZE, ttl=RECOMMENDATION_CACHE_TTL)
+        self._in_flight = SingleFlight()
     
-    def _get_llm(self):
-        """Lazy initialization of the LLM."""
-        if self._llm is None:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key or api_key == "your-gemini-api-key-here":
-                raise ValueError("GOOGLE_API_KEY environment variable is required. Please set it in your .env file.")
-            
-            self._llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash",
-                google_api_key=api_key,
-                temperature=0.7,
-                max_tokens=1000
+    async def connect_vector_store(self) -> None:
+        """Check the Pinecone index exists and open the async client. Run once at startup."""
+        if settings.VECTOR_BACKEND == "local":
+            return
+        if settings.VECTOR_BACKEND == "fake":
+            await self._get_pinecone_index()
+            return
+        try:
+            await asyncio.to_thread(ensure_index, PINECONE_INDEX_NAME)
+            await self._get_pinecone_index()
+            print("✅ Connected to Pinecone index")
+        except Exception as e:
+            print(f"❌ Error connecting to Pinecone: {str(e)}")
+
+    async def _get_pinecone_index(self) -> AsyncVectorStore:
+        """Lazy initialization of the async Pinecone adapter.
+
+        Index existence is checked at startup, so this never lists or creates
+        indexes; the client is constructed once, off the event loop and under
+        VECTOR_CONNECT_TIMEOUT. A failed build is remembered for
+        VECTOR_CONNECT_BACKOFF seconds, so requests fall back to the local
+        index straight away instead of each retrying the connect. With
+        VECTOR_BACKEND=fake the adapter wraps the local index instead.
+        """
+        if self._vector_store is None and settings.VECTOR_BACKEND == "fake":
+            index = FakeVectorIndex(self._get_local_index(), latency=settings.FAKE_VECTOR_LATENCY)
+            self._vector_store = AsyncVectorStore(
+                index,
+                timeout=settings.VECTOR_QUERY_TIMEOUT,
+                max_concurrency=settings.VECTOR_MAX_CONCURRENCY
             )
-        return self._llm
-    
-    def _get_pinecone_index(self):
-        """Lazy initialization of Pinecone index."""
-        if self._pinecone_index is None:
-            api_key = os.getenv("PINECONE_API_KEY")
-            if not api_key:
-                raise ValueError("PINECONE_API_KEY environment variable is required. Please set it in your .env file.")
-            
-            self._pinecone_index = connect_pinecone("career-compass")
-        return self._pinecone_index
+        if self._vector_store is None:
+            if time.monotonic() < self._connect_retry_at:
+                raise ConnectionError(f"Pinecone unavailable (last error: {self._connect_error})")
+            # Concurrent first requests share one connect
+            await self._in_flight.do("pinecone_connect", self._connect_pinecone)
+        return self._vector_store
+
+    async def _connect_pinecone(self) -> None:
+        if self._vector_store is not None:
+            return
+        try:
+            index = await asyncio.wait_for(self._build_pinecone_index(), timeout=settings.VECTOR_CONNECT_TIMEOUT)
+        except Exception as e:
+            self._connect_error = f"{type(e).__name__} {str(e)}"
+            self._connect_retry_at = time.monotonic() + settings.VECTOR_CONNECT_BACKOFF
+            raise
+        self._pinecone_index = index
+        self._vector_store = AsyncVectorStore(
+            index,
+            timeout=settings.VECTOR_QUERY_TIMEOUT,
+            max_concurrency=settings.VECTOR_MAX_CONCURRENCY
+        )
+
+    async def _build_pinecone_index(self):
+        api_key = os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("PINECONE_API_KEY environment variable is required. Please set it in your .env file.")
+        try:
+            # Only the blocking host lookup runs in a thread; IndexAsyncio needs the event loop
+            found = await asyncio.to_thread(get_async_index_host, PINECONE_INDEX_NAME)
+            if found is not None:
+                pc, host = found
+                return pc.IndexAsyncio(host=host)
+        except Exception as e:
+            logger.warning(f"Async Pinecone client unavailable, using thread pool: {str(e)}")
+        return await asyncio.to_thread(get_index, PINECONE_INDEX_NAME)
+
+    async def close(self) -> None:
+        if self._vector_store is not None:
+            await self._vector_store.close()
+            self._vector_store = None
+
+    def _get_local_index(self) -> LocalVectorIndex:
+        """Lazy initialization of the in-process career index.
+
+        Prefers the memory-mapped embedding store so workers share one copy of
+        the matrix; falls back to embedding the catalog JSON.
+        """
+        if self._local_index is None:
+            if os.path.exists(settings.EMBEDDING_STORE_PATH):
+                store = open_embedding_store(settings.EMBEDDING_STORE_PATH)
+                index = LocalVectorIndex.from_matrix(store.ids, store.matrix, store.metadata)
+                print(f"✅ Mapped {len(store)} career embeddings from {store.path}")
+                if len(career_catalog) and store.catalog_version != career_catalog.digest:
+                    print("⚠️  Embedding store is older than the careers table; re-run populate_careers.py")
+            else:
+                index = load_career_index(settings.CAREER_CATALOG_PATH)
+            if len(career_catalog):
+                # The file may trail the careers table; later edits arrive through _LocalIndexSync
+                plan = sync_local_index(index, career_catalog.all())
+                if plan.upserts or plan.deletes:
+                    print(f"🔄 Local vector index: re-embedded {len(plan.upserts)}, removed {len(plan.deletes)} careers")
+            self._local_index = index
+        return self._local_index
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            **self.recommendation_cache.stats(),
+            "vector_store": self._vector_store.stats() if self._vector_store else None,
+            "single_flight": self._in_flight.stats(),
+            "catalog_version": career_catalog.version
+        }
+
+    def warm_up(self) -> None:
+        """Load the local index at startup instead of on the first request."""
+        try:
+            self._get_local_index()
+        except Exception as e:
+            print(f"❌ Error loading local career index: {str(e)}")
 
     async def get_career_recommendations(
         self, 
-        interview_analysis: Dict[str, Any]
+        interview_analysis: Dict[str, Any],
+        mode: str = "llm"
+    ) -> List[Dict[str, Any]]:
+        """Get career recommendations based on interview analysis.
+
+        mode="fast" ranks candidates locally and skips the LLM. Results are
+        cached per analysis fingerprint, mode and catalog version, and
+        concurrent identical requests share one in-flight computation.
+        """
+        key = (analysis_fingerprint(interview_analysis), mode, career_catalog.version)
+        cached = self.recommendation_cache.get(key)
+        if cached is None:
+            cached = await self._in_flight.do(
+                key, lambda: self._compute_recommendations(key, interview_analysis, mode)
+            )
+        # Hand out copies so callers can't mutate the cached entry
+        return [dict(career) for career in cached]
+
+    async def _compute_recommendations(
+        self,
+        key,
+        interview_analysis: Dict[str, Any],
+        mode: str
     ) -> List[Dict[str, Any]]:
-        """Get career recommendations based on interview analysis."""
         try:
-            # Step 1: Get top 10 careers from Pinecone vector database
-            vector_careers = await self._get_vector_careers(interview_analysis)
+            if mode == "fast":
+                candidate_careers = await self._get_candidate_careers(interview_analysis, FAST_CANDIDATE_COUNT)
+                recommended_careers = rank_careers_fast(interview_analysis, candidate_careers)
+                self.recommendation_cache.set(key, recommended_careers)
+                return recommended_careers
+
+            # Step 1: Get candidate careers from hybrid vector + keyword retrieval
+            candidate_careers = await self._get_candidate_careers(interview_analysis)
             
             # Step 2: Use LLM to select and rank top 5 careers
-            recommended_careers = await self._enhance_with_llm(
-                interview_analysis, 
-                vector_careers
-            )
-            
+            try:
+                recommended_careers = await asyncio.wait_for(
+                    self._enhance_with_llm(interview_analysis, candidate_careers),
+                    LLM_TIMEOUT
+                )
+            except Exception as e:
+                # Degrade to the deterministic ranking instead of failing the request;
+                # not cached, so the next request retries the LLM
+                print(f"LLM ranking failed, serving fast ranking: {type(e).__name__} {str(e)}")
+                return rank_careers_fast(interview_analysis, candidate_careers)
+
+            self.recommendation_cache.set(key, recommended_careers)
             return recommended_careers
             
         except Exception as e:
             print(f"Error getting career recommendations: {str(e)}")
             raise e
 
-    async def _get_vector_careers(self, interview_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Get top 10 careers from Pinecone vector database."""
+    async def _get_candidate_careers(
+        self,
+        interview_analysis: Dict[str, Any],
+        limit: int = LLM_CANDIDATE_COUNT
+    ) -> List[Dict[str, Any]]:
+        """Fuse vector, BM25 and skill-overlap rankings with reciprocal rank fusion."""
+        fingerprint = analysis_fingerprint(interview_analysis)
+        candidates_key = f"{fingerprint}:{settings.VECTOR_BACKEND}:hybrid:{limit}:{career_catalog.digest}"
+        cached = embedding_cache.get_candidates(candidates_key)
+        if cached is not None:
+            return cached
+
+        vector_careers, used_fallback = await self._get_vector_careers(
+            interview_analysis, fingerprint, top_k=RETRIEVAL_DEPTH
+        )
+        keyword_hits = bm25_index.search(analysis_to_text(interview_analysis), top_k=RETRIEVAL_DEPTH)
+        skill_matches = skill_index.score(
+            (interview_analysis.get("technical_skills") or []) + (interview_analysis.get("soft_skills") or []),
+            top_k=RETRIEVAL_DEPTH
+        )
+
+        by_key = {career["id"]: career for career in vector_careers}
+        keyword_scores = dict(keyword_hits)
+        skill_overlaps = {match.key: match for match in skill_matches}
+        fused = reciprocal_rank_fusion([
+            [career["id"] for career in vector_careers],
+            [key for key, _ in keyword_hits],
+            [match.key for match in skill_matches],
+        ])
+
+        candidates = []
+        for key, fused_score in fused:
+            career = by_key.get(key)
+            if career is None:
+                record = career_catalog.by_key(key)
+                if record is None:
+                    continue
+                career = {
+                    "id": key,
+                    "score": 0.0,
+                    "title": record["title"],
+                    "description": record["description"],
+                    "required_skills": ", ".join(record["required_skills"])
+                }
+            skill_match = skill_overlaps.get(key)
+            candidates.append({
+                **career,
+                "keyword_score": round(keyword_scores.get(key, 0.0), 4),
+                "skill_overlap": skill_match.jaccard if skill_match else 0.0,
+                "matched_skills": skill_match.matched_skills if skill_match else [],
+                "fusion_score": round(fused_score, 6)
+            })
+            if len(candidates) >= limit:
+                break
+
+        # Don't pin fallback results in the cache once Pinecone is back
+        if not used_fallback:
+            embedding_cache.set_candidates(candidates_key, candidates)
+        return candidates
+
+    async def _get_vector_careers(
+        self,
+        interview_analysis: Dict[str, Any],
+        fingerprint: str = None,
+        top_k: int = 10
+    ):
+        """Get the top_k careers from the configured vector index.
+
+        Returns the careers and whether the local fallback index was used.
+        """
+        query_vector = self._create_query_vector(interview_analysis, fingerprint)
+        used_fallback = False
         try:
-            index = self._get_pinecone_index()
-            
-            # Create a query vector based on interview analysis
-            # For now, we'll use a simple approach - you might want to use sentence transformers
-            # to create proper embeddings from the interview analysis
-            query_vector = self._create_query_vector(interview_analysis)
-            
-            # Query Pinecone for similar careers
-            results = index.query(
+            if settings.VECTOR_BACKEND == "local":
+                results = self._get_local_index().query(
+                    vector=query_vector,
+                    top_k=top_k,
+                    include_metadata=True
+                )
+            else:
+                store = await self._get_pinecone_index()
+                results = await store.query(
+                    vector=query_vector,
+                    top_k=top_k,
+                    include_metadata=True
+                )
+        except Exception as e:
+            print(f"Error querying vector index: {type(e).__name__} {str(e)}")
+            if settings.VECTOR_BACKEND == "local":
+                raise
+            # Fall back to the in-process index if Pinecone is unreachable
+            used_fallback = True
+            results = self._get_local_index().query(
                 vector=query_vector,
-                top_k=10,
+                top_k=top_k,
                 include_metadata=True
             )
-            
-            careers = []
-            for match in results.matches:
-                careers.append({
-                    "id": match.id,
-                    "score": match.score,
-                    "title": match.metadata.get("title", ""),
-                    "description": match.metadata.get("description", ""),
-                    "required_skills": match.metadata.get("required_skills", "")
-                })
-            
-            return careers
-            
-        except Exception as e:
-            print(f"Error querying Pinecone: {str(e)}")
-            # Return some fallback careers if Pinecone fails
-            return [
-                {
-                    "id": "software_engineer",
-                    "score": 0.9,
-                    "title": "Software Engineer",
-                    "description": "Develop software applications and systems",
-                    "required_skills": "Programming, Problem Solving, Teamwork"
-                },
-                {
-                    "id": "data_scientist", 
-                    "score": 0.8,
-                    "title": "Data Scientist",
-                    "description": "Analyze data to help organizations make decisions",
-                    "required_skills": "Statistics, Programming, Machine Learning"
-                }
-            ]
 
-    def _create_query_vector(self, interview_analysis: Dict[str, Any]) -> List[float]:
+        careers = []
+        for match in results.matches:
+            career = {
+                "id": match.id,
+                "score": match.score,
+                "title": match.metadata.get("title", ""),
+                "description": match.metadata.get("description", ""),
+                "required_skills": match.metadata.get("required_skills", "")
+            }
+            if len(career_catalog):
+                # The index can trail the careers table: drop deleted careers, use current text
+                record = career_catalog.by_key(match.id)
+                if record is None:
+                    continue
+                career.update(
+                    title=record["title"],
+                    description=record["description"],
+                    required_skills=", ".join(record["required_skills"])
+                )
+            careers.append(career)
+
+        return careers, used_fallback
+
+    def _create_query_vector(self, interview_analysis: Dict[str, Any], fingerprint: str = None) -> List[float]:
         """Create a query vector from interview analysis."""
-        # For now, we'll create a simple vector based on the analysis
-        # In production, you should use sentence transformers to create proper embeddings
-        
-        # Combine all text from interview analysis
-        text_parts = []
-        
-        # Add technical skills
-        if interview_analysis.get("technical_skills"):
-            text_parts.extend(interview_analysis["technical_skills"])
-        
-        # Add soft skills
-        if interview_analysis.get("soft_skills"):
-            text_parts.extend(interview_analysis["soft_skills"])
-        
-        # Add learning style
-        if interview_analysis.get("learning_style"):
-            text_parts.append(interview_analysis["learning_style"])
-        
-        # Add career interests
-        if interview_analysis.get("career_interests"):
-            text_parts.extend(interview_analysis["career_interests"])
-        
-        # Create a simple hash-based vector (384 dimensions as per Pinecone setup)
-        import hashlib
-        combined_text = " ".join(text_parts).lower()
-        
-        # Create a deterministic vector based on the text
-        vector = [0.0] * 384
-        for i, char in enumerate(combined_text):
-            if i >= 384:
-                break
-            # Use character code to influence vector values
-            vector[i % 384] += ord(char) / 1000.0
-        
-        # Normalize the vector
-        import math
-        magnitude = math.sqrt(sum(x * x for x in vector))
-        if magnitude > 0:
-            vector = [x / magnitude for x in vector]
-        
-        return vector
+        fingerprint = fingerprint or analysis_fingerprint(interview_analysis)
+        vector = embedding_cache.get_vector(fingerprint)
+        if vector is None:
+            # Uses the same featurizer as the catalog indexing scripts
+            vector = embed_text(analysis_to_text(interview_analysis))
+            embedding_cache.set_vector(fingerprint, vector)
+        return vector.tolist()
 
-    async def _enhance_with_llm(
-        self, 
-        interview_analysis: Dict[str, Any], 
-        vector_careers: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Use LLM to select and rank top 5 careers from vector results."""
+    async def stream_career_recommendations(
+        self,
+        interview_analysis: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield LLM-ranked careers one at a time as the model streams them.
+
+        Each career is yielded as soon as its JSON object is complete. Cached
+        rankings are replayed immediately; if the stream fails before any
+        career arrives, the fast local ranking is yielded instead.
+        """
+        key = (analysis_fingerprint(interview_analysis), "llm", career_catalog.version)
+        cached = self.recommendation_cache.get(key)
+        if cached is not None:
+            for career in cached:
+                yield dict(career)
+            return
+
+        candidate_careers = await self._get_candidate_careers(interview_analysis)
+        recommended_careers = []
         try:
-            llm = self._get_llm()
-            
-            # Prepare career data for LLM
-            career_data = ""
-            for i, career in enumerate(vector_careers):
-                career_data += f"""
+            chain = get_chain("career_ranking")
+            parser = JSONArrayStreamParser(key="recommended_careers")
+            # The slot is held for the whole stream
+            async with llm_dispatcher.slot(Priority.STANDARD):
+                async for chunk in chain.astream(self._ranking_inputs(interview_analysis, candidate_careers)):
+                    for career in parser.feed(chunk.content):
+                        recommended_careers.append(career)
+                        yield dict(career)
+        except Exception as e:
+            if recommended_careers:
+                # Careers already sent can't be taken back; end the stream here
+                print(f"LLM stream failed after {len(recommended_careers)} careers: {type(e).__name__} {str(e)}")
+                return
+            print(f"LLM stream failed, serving fast ranking: {type(e).__name__} {str(e)}")
+            for career in rank_careers_fast(interview_analysis, candidate_careers):
+                yield career
+            return
+
+        if parser.done:
+            self.recommendation_cache.set(key, recommended_careers)
+
+    def _ranking_inputs(
+        self,
+        interview_analysis: Dict[str, Any],
+        vector_careers: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Template variables for the ranking chain."""
+        return {
+            "technical_skills": json.dumps(interview_analysis.get("technical_skills", [])),
+            "soft_skills": json.dumps(interview_analysis.get("soft_skills", [])),
+            "learning_style": interview_analysis.get("learning_style", ""),
+            "career_interests": json.dumps(interview_analysis.get("career_interests", [])),
+            "confidence_level": interview_analysis.get("confidence_level", ""),
+            "career_data": self._format_candidates(vector_careers)
+        }
+
+    def _format_candidates(self, vector_careers: List[Dict[str, Any]]) -> str:
+        # Prepare career data for LLM
+        career_data = ""
+        for i, career in enumerate(vector_careers):
+            career_data += f"""
 Career {i+1}: {career['title']}
 Description: {career['description']}
 Required Skills: {career['required_skills']}
 Vector Score: {career['score']}
+Keyword Score: {career.get('keyword_score', 0.0)}
+Matching Student Skills: {', '.join(career.get('matched_skills', [])) or 'None'}
 """
-            
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert career counselor. Based on a student's interview analysis and a list of potential careers from a vector database, select the top 5 most suitable careers.
-
-                Guidelines:
-                1. Consider the student's technical skills, soft skills, learning style, and career interests
-                2. Match careers to the student's profile and preferences
-                3. Consider the vector similarity scores but don't rely solely on them
-                4. Provide reasoning for each recommendation
-                5. Rank careers from most suitable to least suitable
-                6. Additionally, include a concise current market and job outlook for Pakistan for each career (demand trends, key cities/sectors hiring, typical entry-level roles, indicative salary ranges in PKR when possible, and short note on growth outlook). Keep it factual and brief.
-
-                Return a JSON object with this structure:
-                {{
-                    "recommended_careers": [
-                        {{
-                            "title": "Career Title",
-                            "description": "Brief description",
-                            "match_reason": "Why this career matches the student",
-                            "confidence_score": 0.95,
-                            "required_skills": ["skill1", "skill2"],
-                            "learning_path": "Suggested learning path",
-                            "market_job_analysis_pakistan": "Concise Pakistan-specific market and job analysis"
-                        }}
-                    ]
-                }}"""),
-                ("human", """Student Interview Analysis:
-Technical Skills: {technical_skills}
-Soft Skills: {soft_skills}
-Learning Style: {learning_style}
-Career Interests: {career_interests}
-Confidence Level: {confidence_level}
-
-Available Careers from Vector Database:
-{career_data}
-
-Select only the top 5 most suitable careers:""")
-            ])
-            
-            chain = prompt | llm
-            response = await chain.ainvoke({
-                "technical_skills": json.dumps(interview_analysis.get("technical_skills", [])),
-                "soft_skills": json.dumps(interview_analysis.get("soft_skills", [])),
-                "learning_style": interview_analysis.get("learning_style", ""),
-                "career_interests": json.dumps(interview_analysis.get("career_interests", [])),
-                "confidence_level": interview_analysis.get("confidence_level", ""),
-                "career_data": career_data
-            })
-            
-            try:
-                content = response.content.strip()
-                if content.startswith("```json"):
-                    content = content[7:-3]
-                elif content.startswith("```"):
-                    content = content[3:-3]
-                
-                result = json.loads(content)
-                return result.get("recommended_careers", [])
-                
-            except json.JSONDecodeError as json_err:
-                print(f"JSON parsing error: {str(json_err)}")
-                print(f"Raw response: {response.content}")
-                raise ValueError(f"Failed to parse LLM response: {str(json_err)}")
-                
+        return career_data
+
+    async def analyze_and_recommend(
+        self,
+        interests: str,
+        responses: List[str]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Infer the skill analysis and rank careers from a transcript in one LLM call.
+
+        Candidates are retrieved up front from a provisional analysis built
+        from the interests and the skills mentioned in the answers. If the
+        LLM call fails, the provisional analysis and the fast local ranking
+        are returned instead.
+        """
+        provisional = transcript_to_analysis(interests, responses)
+        candidate_careers = await self._get_candidate_careers(provisional)
+        combined_responses = "\n".join([f"Response {i+1}: {response}" for i, response in enumerate(responses)])
+        try:
+            chain = get_chain("analyze_and_recommend")
+            inputs = {
+                "interests": interests,
+                "responses": combined_responses,
+                "career_data": self._format_candidates(candidate_careers)
+            }
+            response = await asyncio.wait_for(
+                llm_dispatcher.run(lambda: chain.ainvoke(inputs), Priority.STANDARD),
+                LLM_TIMEOUT
+            )
+            result = parse_json_response(response.content)
+            analysis = normalize_analysis(result.get("analysis"))
+            recommended_careers = result.get("recommended_careers") or []
+            if not isinstance(recommended_careers, list):
+                raise ValueError("recommended_careers is not a list")
+            recommended_careers = [career for career in recommended_careers if isinstance(career, dict)]
+        except Exception as e:
+            print(f"Combined analysis failed, serving provisional analysis and fast ranking: {type(e).__name__} {str(e)}")
+            return provisional, rank_careers_fast(provisional, candidate_careers)
+
+        # Later /career/recommendations calls for this analysis hit the cache
+        key = (analysis_fingerprint(analysis), "llm", career_catalog.version)
+        self.recommendation_cache.set(key, recommended_careers)
+        return analysis, [dict(career) for career in recommended_careers]
+
+    async def _enhance_with_llm(
+        self, 
+        interview_analysis: Dict[str, Any], 
+        vector_careers: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Use LLM to select and rank top 5 careers from retrieved candidates."""
+        try:
+            chain = get_chain("career_ranking")
+            inputs = self._ranking_inputs(interview_analysis, vector_careers)
+            response = await llm_dispatcher.run(lambda: chain.ainvoke(inputs), Priority.STANDARD)
+            result = parse_json_response(response.content)
+            return result.get("recommended_careers", [])
         except Exception as e:
             print(f"Error enhancing with LLM: {str(e)}")
             raise e
 
 # Global instance
-career_recommendation_service = CareerRecommendationService() 
\ No newline at end of file
+career_recommendation_service = CareerRecommendationService()
+career_catalog.subscribe(_CatalogCacheInvalidator(career_recommendation_service))
+career_catalog.subscribe(_LocalIndexSync(career_recommendation_service)) 
\ No newline at end of file
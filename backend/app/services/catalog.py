@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Career
+from app.services.embedding_store import catalog_version
+from app.services.vector_search import career_vector_id
+
+
+class CatalogListener:
+    """Receives career catalog changes; override what you need."""
+
+    def rebuild(self, careers: List[Dict[str, Any]]) -> None:
+        self.on_change()
+
+    def upsert(self, career: Dict[str, Any]) -> None:
+        self.on_change()
+
+    def remove(self, career_id: int) -> None:
+        self.on_change()
+
+    def on_change(self) -> None:
+        pass
+
+
+class CareerCatalog:
+    """In-memory copy of the careers table shared by the retrieval indexes.
+
+    Loaded once at startup and kept current by the /careers endpoints, which
+    forward each create, patch and delete so listeners can update incrementally.
+    """
+
+    def __init__(self):
+        self._careers: Dict[int, Dict[str, Any]] = {}
+        self._ids_by_key: Dict[str, int] = {}
+        self._listeners: List[CatalogListener] = []
+        self.version = 0
+        self._digest = ""
+        self._digest_version = -1
+
+    def __len__(self) -> int:
+        return len(self._careers)
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        self._listeners.append(listener)
+        if self._careers:
+            listener.rebuild(self.all())
+
+    @property
+    def digest(self) -> str:
+        """Content digest of the catalog; unlike `version`, it matches across workers and restarts."""
+        if self._digest_version != self.version:
+            self._digest = catalog_version(self.all())
+            self._digest_version = self.version
+        return self._digest
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._careers.values())
+
+    def get(self, career_id: int) -> Optional[Dict[str, Any]]:
+        return self._careers.get(career_id)
+
+    def by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a career by its vector id (normalized title)."""
+        career_id = self._ids_by_key.get(key)
+        return self._careers.get(career_id) if career_id is not None else None
+
+    async def load(self, session: AsyncSession) -> None:
+        result = await session.execute(select(Career))
+        self._careers = {career.id: to_record(career) for career in result.scalars().all()}
+        self._ids_by_key = {record["key"]: career_id for career_id, record in self._careers.items()}
+        self.version += 1
+        for listener in self._listeners:
+            listener.rebuild(self.all())
+
+    def upsert(self, career: Career) -> None:
+        record = to_record(career)
+        previous = self._careers.get(record["id"])
+        if previous is not None and self._ids_by_key.get(previous["key"]) == record["id"]:
+            del self._ids_by_key[previous["key"]]
+        self._careers[record["id"]] = record
+        self._ids_by_key[record["key"]] = record["id"]
+        self.version += 1
+        for listener in self._listeners:
+            listener.upsert(record)
+
+    def remove(self, career_id: int) -> None:
+        record = self._careers.pop(career_id, None)
+        if record is None:
+            return
+        if self._ids_by_key.get(record["key"]) == career_id:
+            del self._ids_by_key[record["key"]]
+        self.version += 1
+        for listener in self._listeners:
+            listener.remove(career_id)
+
+
+def to_record(career: Career) -> Dict[str, Any]:
+    """Plain-dict snapshot of a Career row."""
+    required_skills = career.required_skills or []
+    if isinstance(required_skills, str):
+        required_skills = [skill.strip() for skill in required_skills.split(",") if skill.strip()]
+    return {
+        "id": career.id,
+        "key": career_vector_id(career.title or ""),
+        "title": career.title or "",
+        "description": career.description or "",
+        "required_skills": list(required_skills),
+        "programs": list(career.programs or []),
+    }
+
+
+# Global instance
+career_catalog = CareerCatalog()
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Career
+from app.services.vector_search import (
+    HASH_METADATA_KEY,
+    career_content_hash,
+    career_vector_id,
+    careers_to_vectors,
+)
+
+
+@dataclass
+class SyncPlan:
+    upserts: List[Dict[str, Any]] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+@dataclass
+class SyncReport:
+    upserted: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+
+async def load_sql_catalog(session: AsyncSession) -> List[Dict[str, Any]]:
+    """Read the careers table as plain dicts."""
+    result = await session.execute(
+        select(Career.title, Career.description, Career.required_skills)
+    )
+    return [
+        {"title": title, "description": description, "required_skills": required_skills}
+        for title, description, required_skills in result.all()
+    ]
+
+
+def fetch_index_hashes(index, batch_size: int = 100) -> Dict[str, str]:
+    """Map every vector id in the index to the content hash in its metadata."""
+    hashes: Dict[str, str] = {}
+    for page in index.list(limit=batch_size):
+        ids = list(page)
+        if not ids:
+            continue
+        fetched = index.fetch(ids=ids)
+        for vector_id, vector in fetched.vectors.items():
+            metadata = getattr(vector, "metadata", None) or {}
+            hashes[vector_id] = metadata.get(HASH_METADATA_KEY, "")
+    return hashes
+
+
+def plan_sync(careers: Sequence[Dict[str, Any]], index_hashes: Dict[str, str]) -> SyncPlan:
+    """Diff the catalog against the index by per-record content hash."""
+    plan = SyncPlan()
+    catalog: Dict[str, Dict[str, Any]] = {}
+    for career in careers:
+        title = career.get("title") or ""
+        if title.strip():
+            # Later duplicates of a title win, matching insertion order in SQL
+            catalog[career_vector_id(title)] = career
+
+    for vector_id, career in catalog.items():
+        if index_hashes.get(vector_id) == career_content_hash(career):
+            plan.unchanged += 1
+        else:
+            plan.upserts.append(career)
+
+    plan.deletes = [vector_id for vector_id in index_hashes if vector_id not in catalog]
+    return plan
+
+
+def sync_local_index(index, careers: Sequence[Dict[str, Any]]) -> SyncPlan:
+    """Apply the catalog diff to an in-process index, in place."""
+    plan = plan_sync(careers, fetch_index_hashes(index))
+    if plan.upserts:
+        index.upsert(careers_to_vectors(plan.upserts))
+    if plan.deletes:
+        index.delete(plan.deletes)
+    return plan
+
+
+async def sync_catalog(
+    index,
+    careers: Sequence[Dict[str, Any]],
+    batch_size: int = 100,
+    max_in_flight: int = 4,
+) -> SyncReport:
+    """Bring the vector index in line with the catalog, touching only changed records.
+
+    Index calls are synchronous client calls, so each batch runs in a worker
+    thread; a semaphore bounds how many batches are in flight at once.
+    """
+    started = time.perf_counter()
+    index_hashes = await asyncio.to_thread(fetch_index_hashes, index, batch_size)
+    plan = plan_sync(careers, index_hashes)
+
+    vectors = careers_to_vectors(plan.upserts)
+    for vector in vectors:
+        vector["values"] = vector["values"].tolist()
+
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def run_batch(call, **kwargs):
+        async with semaphore:
+            await asyncio.to_thread(call, **kwargs)
+
+    tasks = [
+        run_batch(index.upsert, vectors=vectors[start:start + batch_size])
+        for start in range(0, len(vectors), batch_size)
+    ]
+    tasks += [
+        run_batch(index.delete, ids=plan.deletes[start:start + batch_size])
+        for start in range(0, len(plan.deletes), batch_size)
+    ]
+    await asyncio.gather(*tasks)
+
+    return SyncReport(
+        upserted=len(vectors),
+        deleted=len(plan.deletes),
+        unchanged=plan.unchanged,
+        seconds=time.perf_counter() - started,
+    )
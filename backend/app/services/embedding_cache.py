@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.services.embeddings import EMBEDDING_DIM, EMBEDDING_VERSION
+
+FINGERPRINT_LIST_FIELDS = ("technical_skills", "soft_skills", "career_interests")
+FINGERPRINT_TEXT_FIELDS = ("learning_style", "confidence_level")
+
+
+def analysis_fingerprint(interview_analysis: Dict[str, Any]) -> str:
+    """Canonical hash of an interview analysis.
+
+    List fields are lowercased, de-duplicated and sorted, and text fields are
+    lowercased with whitespace collapsed, so the same skills and interests in
+    a different order or casing produce the same fingerprint.
+    """
+    canonical: Dict[str, Any] = {}
+    for field in FINGERPRINT_LIST_FIELDS:
+        value = interview_analysis.get(field) or []
+        if isinstance(value, str):
+            value = [value]
+        canonical[field] = sorted({" ".join(str(item).lower().split()) for item in value if item})
+    for field in FINGERPRINT_TEXT_FIELDS:
+        canonical[field] = " ".join(str(interview_analysis.get(field) or "").lower().split())
+
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """SQLite-backed second tier so warm entries survive a worker restart."""
+
+    def __init__(self, path: str):
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM embedding_cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embedding_cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embedding_cache WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+
+
+class EmbeddingCache:
+    """LRU cache of query embeddings and top-k candidate lists per analysis fingerprint."""
+
+    def __init__(self, max_size: int = 2048, disk_path: Optional[str] = None):
+        self.vectors = LRUCache(max_size)
+        self.candidates = LRUCache(max_size)
+        self.disk_hits = 0
+        self._disk = _DiskTier(disk_path) if disk_path else None
+
+    def get_vector(self, fingerprint: str) -> Optional[np.ndarray]:
+        vector = self.vectors.get(fingerprint)
+        if vector is None and self._disk is not None:
+            raw = self._disk.get("vector", self._vector_key(fingerprint))
+            if raw is not None:
+                vector = np.frombuffer(raw, dtype=np.float32)
+                if vector.shape == (EMBEDDING_DIM,):
+                    self.disk_hits += 1
+                    self.vectors.set(fingerprint, vector)
+                else:
+                    vector = None
+        return vector
+
+    def set_vector(self, fingerprint: str, vector: np.ndarray) -> None:
+        vector = np.asarray(vector, dtype=np.float32)
+        self.vectors.set(fingerprint, vector)
+        if self._disk is not None:
+            self._disk.set("vector", self._vector_key(fingerprint), vector.tobytes())
+
+    @staticmethod
+    def _vector_key(fingerprint: str) -> str:
+        # Persisted vectors outlive the process; never serve one from another embedding model
+        return f"{EMBEDDING_VERSION}:{fingerprint}"
+
+    def get_candidates(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        candidates = self.candidates.get(key)
+        if candidates is None and self._disk is not None:
+            raw = self._disk.get("candidates", key)
+            if raw is not None:
+                candidates = json.loads(raw)
+                self.disk_hits += 1
+                self.candidates.set(key, candidates)
+        return candidates
+
+    def set_candidates(self, key: str, candidates: List[Dict[str, Any]]) -> None:
+        self.candidates.set(key, candidates)
+        if self._disk is not None:
+            self._disk.set("candidates", key, json.dumps(candidates).encode("utf-8"))
+
+    def clear_candidates(self) -> None:
+        """Drop cached candidate lists, e.g. after the career catalog changes."""
+        self.candidates.clear()
+        if self._disk is not None:
+            self._disk.clear("candidates")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "vectors": self.vectors.stats(),
+            "candidates": self.candidates.stats(),
+            "disk_enabled": self._disk is not None,
+            "disk_hits": self.disk_hits,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    max_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+    disk_path=os.getenv("EMBEDDING_CACHE_PATH") or None,
+)
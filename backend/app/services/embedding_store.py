@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from app.services.embeddings import EMBEDDING_DIM
+from app.services.vector_search import career_content_hash, career_vector_id, careers_to_vectors
+
+MAGIC = b"CCEMBED1"
+HEADER_SIZE = 256
+# magic, dtype code, dim, count, matrix bytes, id table bytes, catalog version, sha256
+_HEADER_FORMAT = "<8sBIIQQ64s32s"
+_DTYPES = {1: np.float32, 2: np.float16}
+_DTYPE_CODES = {np.dtype(dtype): code for code, dtype in _DTYPES.items()}
+
+
+@dataclass
+class EmbeddingStore:
+    """A read-only, memory-mapped embedding matrix plus its id table.
+
+    The matrix is an np.memmap over the file, so every worker that opens the
+    same file shares its pages through the OS page cache.
+    """
+
+    path: str
+    ids: List[str]
+    metadata: List[Dict[str, Any]]
+    matrix: np.ndarray
+    catalog_version: str
+    checksum: str
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def catalog_version(careers: Sequence[Dict[str, Any]]) -> str:
+    """Digest of the catalog contents, independent of record order."""
+    entries = sorted(
+        f"{career_vector_id(career.get('title') or '')}:{career_content_hash(career)}"
+        for career in careers
+        if (career.get("title") or "").strip()
+    )
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def write_embedding_store(
+    path: str,
+    ids: Sequence[str],
+    matrix: np.ndarray,
+    metadata: Sequence[Dict[str, Any]],
+    version: str,
+    dtype: str = "float32",
+) -> str:
+    """Atomically write an embedding file and return its checksum."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.dtype(dtype))
+    if matrix.ndim != 2 or matrix.shape[0] != len(ids) or len(ids) != len(metadata):
+        raise ValueError("matrix, ids and metadata must describe the same rows")
+
+    matrix_bytes = matrix.tobytes()
+    id_table = json.dumps(
+        [{"id": vector_id, "metadata": meta} for vector_id, meta in zip(ids, metadata)],
+        separators=(",", ":"),
+    ).encode("utf-8")
+    digest = hashlib.sha256(matrix_bytes + id_table)
+
+    header = struct.pack(
+        _HEADER_FORMAT,
+        MAGIC,
+        _DTYPE_CODES[matrix.dtype],
+        matrix.shape[1],
+        matrix.shape[0],
+        len(matrix_bytes),
+        len(id_table),
+        version.encode("ascii")[:64],
+        digest.digest(),
+    ).ljust(HEADER_SIZE, b"\0")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(matrix_bytes)
+        f.write(id_table)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return digest.hexdigest()
+
+
+def open_embedding_store(path: str, verify: bool = False) -> EmbeddingStore:
+    """Memory-map an embedding file read-only."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < struct.calcsize(_HEADER_FORMAT):
+            raise ValueError(f"{path} is not an embedding store")
+        magic, dtype_code, dim, count, matrix_length, ids_length, version, checksum = struct.unpack_from(
+            _HEADER_FORMAT, header
+        )
+        if magic != MAGIC or dtype_code not in _DTYPES:
+            raise ValueError(f"{path} is not an embedding store")
+        f.seek(HEADER_SIZE + matrix_length)
+        id_table = f.read(ids_length)
+
+    dtype = np.dtype(_DTYPES[dtype_code])
+    if matrix_length != dim * count * dtype.itemsize:
+        raise ValueError(f"{path} has an inconsistent header")
+
+    if count:
+        matrix = np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count, dim))
+    else:
+        matrix = np.zeros((0, dim), dtype=dtype)
+
+    if verify:
+        actual = hashlib.sha256(matrix.tobytes() + id_table).digest()
+        if actual != checksum:
+            raise ValueError(f"{path} failed checksum verification")
+
+    entries = json.loads(id_table.decode("utf-8"))
+    return EmbeddingStore(
+        path=path,
+        ids=[entry["id"] for entry in entries],
+        metadata=[entry["metadata"] for entry in entries],
+        matrix=matrix,
+        catalog_version=version.rstrip(b"\0").decode("ascii"),
+        checksum=checksum.hex(),
+    )
+
+
+def export_career_embeddings(
+    careers: Sequence[Dict[str, Any]],
+    path: str,
+    dtype: str = "float32",
+) -> EmbeddingStore:
+    """Embed the catalog and write it as an embedding store for the workers."""
+    unique: Dict[str, Dict[str, Any]] = {}
+    for vector in careers_to_vectors(careers):
+        if vector["id"]:
+            unique[vector["id"]] = vector
+    vectors = list(unique.values())
+
+    matrix = np.stack([vector["values"] for vector in vectors]) if vectors else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    write_embedding_store(
+        path,
+        [vector["id"] for vector in vectors],
+        matrix,
+        [vector["metadata"] for vector in vectors],
+        catalog_version(careers),
+        dtype=dtype,
+    )
+    return open_embedding_store(path, verify=True)
@@ -0,0 +1,113 @@
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_DIM = 384
+# Bump whenever the featurizer output changes so indexed vectors get rebuilt
+EMBEDDING_VERSION = "hash-ngram-v1"
+NGRAM_SIZE = 3
+TOKEN_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase the text and collapse it to space-separated tokens."""
+    return " ".join(_TOKEN_RE.findall((text or "").lower()))
+
+
+def embed_texts(texts: Sequence[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Embed N texts at once into an (N, dim) float32 matrix of unit rows.
+
+    Each text is featurized as signed hashed counts of its tokens and of its
+    character n-grams. N-gram hashes are computed over one concatenated byte
+    buffer for the whole batch, so there is no per-character Python loop.
+    """
+    normalized = [f" {normalize_text(text)} " for text in texts]
+    out = np.zeros((len(normalized), dim), dtype=np.float32)
+    if not normalized:
+        return out
+
+    token_rows = [row for row, text in enumerate(normalized) for _ in text.split()]
+    token_hashes = [zlib.crc32(token.encode("utf-8")) for text in normalized for token in text.split()]
+    if token_hashes:
+        hashes = np.asarray(token_hashes, dtype=np.uint64) * _FNV_PRIME
+        _scatter(out, np.asarray(token_rows, dtype=np.int64), hashes, TOKEN_WEIGHT)
+
+    rows, hashes = _char_ngram_hashes([text.encode("utf-8") for text in normalized])
+    if hashes.size:
+        _scatter(out, rows, hashes, NGRAM_WEIGHT)
+
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Embed a single text into a (dim,) float32 unit vector."""
+    return embed_texts([text], dim)[0]
+
+
+def analysis_to_text(interview_analysis: Dict[str, Any]) -> str:
+    """Flatten an interview analysis into the text used for its query embedding.
+
+    List fields are sorted so the text (and its embedding) does not depend on
+    the order in which skills and interests were reported.
+    """
+    text_parts: List[str] = []
+    text_parts.extend(sorted(_as_list(interview_analysis.get("technical_skills")), key=str.lower))
+    text_parts.extend(sorted(_as_list(interview_analysis.get("soft_skills")), key=str.lower))
+    text_parts.extend(_as_list(interview_analysis.get("learning_style")))
+    text_parts.extend(sorted(_as_list(interview_analysis.get("career_interests")), key=str.lower))
+    return " ".join(text_parts)
+
+
+def career_to_text(title: str, description: Optional[str], required_skills: Any) -> str:
+    """Flatten a career record into the text used for its catalog embedding."""
+    return " ".join([title or "", description or "", skills_to_text(required_skills)])
+
+
+def skills_to_text(required_skills: Any) -> str:
+    """Render required_skills (JSON list or legacy comma string) as one string."""
+    return ", ".join(_as_list(required_skills))
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value if item]
+
+
+def _char_ngram_hashes(encoded: List[bytes]):
+    """FNV-1a hashes of every character n-gram that stays inside one text."""
+    lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    count = buffer.size - NGRAM_SIZE + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+
+    hashes = np.full(count, _FNV_OFFSET, dtype=np.uint64)
+    for offset in range(NGRAM_SIZE):
+        hashes ^= buffer[offset:offset + count]
+        hashes *= _FNV_PRIME
+
+    rows = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths)[:count]
+    ends = np.cumsum(lengths)[rows]
+    valid = np.arange(count) + NGRAM_SIZE <= ends
+    return rows[valid], hashes[valid]
+
+
+def _scatter(out: np.ndarray, rows: np.ndarray, hashes: np.ndarray, weight: float) -> None:
+    """Add signed, weighted hash counts into out[rows, hash % dim]."""
+    n_rows, dim = out.shape
+    buckets = (hashes % np.uint64(dim)).astype(np.int64)
+    signs = 1.0 - 2.0 * ((hashes >> np.uint64(32)) & np.uint64(1)).astype(np.float32)
+    flat = np.bincount(rows * dim + buckets, weights=signs * weight, minlength=n_rows * dim)
+    out += flat.reshape(n_rows, dim).astype(np.float32)
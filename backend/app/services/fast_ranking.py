@@ -0,0 +1,99 @@
+from typing import Any, Dict, List
+
+from app.services.embeddings import normalize_text
+from app.services.skills import normalize_skill, normalize_skills
+
+# Weights of each signal in the local ranking score
+VECTOR_WEIGHT = 0.4
+SKILL_WEIGHT = 0.4
+INTEREST_WEIGHT = 0.2
+
+
+def rank_careers_fast(
+    interview_analysis: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    top_k: int = 5
+) -> List[Dict[str, Any]]:
+    """Rank candidates locally by vector score, skill overlap and interest match.
+
+    Returns the same shape as the LLM ranking step, with template-built text
+    fields, so callers can use it instead of (or as a fallback for) the LLM.
+    """
+    student_skills = normalize_skills(
+        (interview_analysis.get("technical_skills") or []) + (interview_analysis.get("soft_skills") or [])
+    )
+    interests = [i for i in (interview_analysis.get("career_interests") or []) if isinstance(i, str) and i.strip()]
+
+    vector_scores = [float(c.get("score") or 0.0) for c in candidates]
+    top_vector = max(vector_scores, default=0.0)
+
+    scored = []
+    for career, vector_score in zip(candidates, vector_scores):
+        # Keep the catalog's spelling of each skill for the template text
+        career_skills = {normalize_skill(skill): skill for skill in _skill_list(career.get("required_skills"))}
+        career_skills.pop("", None)
+        matched = [skill for key, skill in career_skills.items() if key in student_skills]
+        missing = [skill for key, skill in career_skills.items() if key not in student_skills]
+        union = len(set(career_skills) | set(student_skills))
+        skill_score = len(matched) / union if union else 0.0
+
+        career_terms = set(normalize_text(f"{career.get('title', '')} {career.get('description', '')}").split())
+        matched_interests = [i for i in interests if career_terms & set(normalize_text(i).split())]
+        interest_score = len(matched_interests) / len(interests) if interests else 0.0
+
+        relative_vector = vector_score / top_vector if top_vector > 0 else 0.0
+        score = VECTOR_WEIGHT * relative_vector + SKILL_WEIGHT * skill_score + INTEREST_WEIGHT * interest_score
+        scored.append((score, career, matched, missing, matched_interests))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [
+        {
+            "title": career.get("title", ""),
+            "description": career.get("description", ""),
+            "match_reason": _match_reason(career.get("title", ""), matched, matched_interests),
+            "confidence_score": round(min(max(score, 0.0), 1.0), 2),
+            "required_skills": _skill_list(career.get("required_skills")),
+            "learning_path": _learning_path(career.get("title", ""), matched, missing),
+        }
+        for score, career, matched, missing, matched_interests in scored[:top_k]
+    ]
+
+
+def _skill_list(required_skills: Any) -> List[str]:
+    if isinstance(required_skills, str):
+        return [skill.strip() for skill in required_skills.split(",") if skill.strip()]
+    return list(required_skills or [])
+
+
+def _match_reason(title: str, matched: List[str], interests: List[str]) -> str:
+    role = f"{_article(title)} {title}"
+    parts = []
+    if matched:
+        parts.append(f"your skills in {_join(matched)} are a direct fit for what {role} does")
+    if interests:
+        parts.append(f"it connects with your interest in {_join(interests)}")
+    if not parts:
+        return f"Your overall profile is similar to people who work as {role}."
+    text = ", and ".join(parts)
+    return text[0].upper() + text[1:] + "."
+
+
+def _learning_path(title: str, matched: List[str], missing: List[str]) -> str:
+    steps = []
+    if matched:
+        steps.append(f"Build on your {_join(matched[:2])} with harder projects")
+    if missing:
+        steps.append(f"learn {_join(missing[:3])} through courses and practice")
+    steps.append(f"build a small portfolio of {title} work and look for internships")
+    text = ", then ".join(steps)
+    return text[0].upper() + text[1:] + "."
+
+
+def _article(title: str) -> str:
+    return "an" if title[:1].lower() in "aeiou" else "a"
+
+
+def _join(items: List[str]) -> str:
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
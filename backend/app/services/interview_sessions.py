@@ -0,0 +1,188 @@
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import InterviewSession
+from app.services.transcript import TranscriptSummary
+
+INTERVIEW_SESSION_CACHE_SIZE = int(os.getenv("INTERVIEW_SESSION_CACHE_SIZE", "2048"))
+
+
+class InterviewSessionConflict(Exception):
+    """The stored session changed since it was read (another request or worker wrote a turn)."""
+
+
+@dataclass
+class InterviewState:
+    """Interview transcript as of `version` in the database (0 until first saved)."""
+
+    id: str
+    student_id: int
+    interests: str
+    questions: List[str] = field(default_factory=list)
+    responses: List[str] = field(default_factory=list)
+    is_complete: bool = False
+    summary: TranscriptSummary = field(default_factory=TranscriptSummary)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    version: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+
+    @property
+    def next_question_number(self) -> int:
+        return len(self.questions) + 1
+
+    def copy(self) -> "InterviewState":
+        """Working copy for one turn; shares the lock but none of the transcript."""
+        return replace(
+            self,
+            questions=list(self.questions),
+            responses=list(self.responses),
+            summary=TranscriptSummary.from_dict(self.summary.to_dict()),
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "student_id": self.student_id,
+            "interests": self.interests,
+            "questions": list(self.questions),
+            "responses": list(self.responses),
+            "is_complete": self.is_complete,
+            "transcript_summary": self.summary.to_dict(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class InterviewSessionStore:
+    """Bounded LRU of interview sessions, written through to the database.
+
+    Every create and turn is saved before the response goes out, with a
+    compare-and-swap on `interview_sessions.version`, so any worker can serve
+    any session and a stale copy can never overwrite a newer one. A cached
+    copy is revalidated with a primary-key lookup of the version on each get,
+    and the transcript is only reloaded when another worker has moved it on.
+
+    Reads end their transaction before returning, so no connection is held
+    while a turn waits on the LLM. Turns are built on a `copy()` and only
+    applied to the shared state once committed.
+    """
+
+    def __init__(self, max_size: int = INTERVIEW_SESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._sessions: "OrderedDict[str, InterviewState]" = OrderedDict()
+        self.hits = 0
+        self.db_loads = 0
+        self.writes = 0
+        self.conflicts = 0
+
+    def create(self, student_id: int, interests: str) -> InterviewState:
+        """A new, unsaved session; `save` inserts it."""
+        return InterviewState(id=uuid.uuid4().hex, student_id=student_id, interests=interests)
+
+    async def get(self, session: AsyncSession, session_id: str, student_id: int) -> Optional[InterviewState]:
+        """Return the student's session, or None if it doesn't exist or belongs to someone else."""
+        try:
+            state = await self._load(session, session_id)
+        finally:
+            # Release the connection; callers go on to wait on the LLM
+            await session.rollback()
+        return state if state is not None and state.student_id == student_id else None
+
+    async def _load(self, session: AsyncSession, session_id: str) -> Optional[InterviewState]:
+        state = self._sessions.get(session_id)
+        if state is not None:
+            stored_version = await session.scalar(
+                select(InterviewSession.version).where(InterviewSession.id == session_id)
+            )
+            if stored_version == state.version:
+                self.hits += 1
+                self._sessions.move_to_end(session_id)
+                return state
+            self._sessions.pop(session_id, None)
+
+        row = await session.get(InterviewSession, session_id, populate_existing=True)
+        if row is None:
+            return None
+        self.db_loads += 1
+        state = InterviewState(
+            id=row.id,
+            student_id=row.student_id,
+            interests=row.interests,
+            questions=list(row.questions or []),
+            responses=list(row.responses or []),
+            is_complete=bool(row.is_complete),
+            summary=TranscriptSummary.from_dict(row.transcript_summary),
+            created_at=row.created_at or datetime.utcnow(),
+            updated_at=row.updated_at or datetime.utcnow(),
+            version=row.version or 0,
+        )
+        self._put(state)
+        return state
+
+    async def save(self, session: AsyncSession, state: InterviewState, turn: Optional[InterviewState] = None) -> None:
+        """Write `turn` (a `state.copy()` with the new turn applied) and commit.
+
+        `state` only takes on the turn once it is committed, so a failed save
+        leaves it as the database has it for requests waiting on its lock.
+        Raises InterviewSessionConflict if the stored version moved on since
+        `state` was read. On any failure the cached copy is dropped, so the
+        next get reloads what the database has.
+        """
+        turn = turn or state
+        turn.updated_at = datetime.utcnow()
+        row = turn.to_row()
+        try:
+            if state.version == 0:
+                session.add(InterviewSession(**row, version=1))
+            else:
+                result = await session.execute(
+                    update(InterviewSession)
+                    .where(InterviewSession.id == state.id, InterviewSession.version == state.version)
+                    .values(**row, version=state.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount != 1:
+                    self.conflicts += 1
+                    raise InterviewSessionConflict(state.id)
+            await session.commit()
+        except BaseException:
+            self._sessions.pop(state.id, None)
+            await session.rollback()
+            raise
+        state.questions = turn.questions
+        state.responses = turn.responses
+        state.is_complete = turn.is_complete
+        state.summary = turn.summary
+        state.updated_at = turn.updated_at
+        state.version += 1
+        self.writes += 1
+        self._put(state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._sessions),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "db_loads": self.db_loads,
+            "writes": self.writes,
+            "conflicts": self.conflicts,
+        }
+
+    def _put(self, state: InterviewState) -> None:
+        self._sessions[state.id] = state
+        self._sessions.move_to_end(state.id)
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
+
+
+# Global instance
+interview_session_store = InterviewSessionStore()
@@ -0,0 +1,121 @@
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from app.services.catalog import CatalogListener, career_catalog
+from app.services.embeddings import normalize_text
+
+# Title terms are counted this many times so title hits outrank body hits
+TITLE_BOOST = 2
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize_text(text).split()
+
+
+def career_terms(career: Dict[str, Any]) -> List[str]:
+    """Terms indexed for a career: title, description, required_skills and programs."""
+    terms = tokenize(career.get("title", "")) * TITLE_BOOST
+    terms += tokenize(career.get("description", ""))
+    for field in ("required_skills", "programs"):
+        for value in career.get(field) or []:
+            terms += tokenize(str(value))
+    return terms
+
+
+class BM25Index(CatalogListener):
+    """In-memory BM25 inverted index over the career catalog.
+
+    Postings, document lengths and the total length are maintained per
+    document, so catalog edits update the index without a full rebuild.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._doc_keys: Dict[int, str] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def rebuild(self, careers: List[Dict[str, Any]]) -> None:
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._doc_keys = {}
+        self._total_length = 0
+        for career in careers:
+            self._add(career)
+
+    def upsert(self, career: Dict[str, Any]) -> None:
+        self._discard(career["id"])
+        self._add(career)
+
+    def remove(self, career_id: int) -> None:
+        self._discard(career_id)
+
+    def search(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Return (career key, score) pairs, best first, one per key."""
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0:
+            return []
+        avg_length = self._total_length / doc_count
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best: Dict[str, float] = {}
+        for doc_id, score in scores.items():
+            key = self._doc_keys[doc_id]
+            if score > best.get(key, 0.0):
+                best[key] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def _add(self, career: Dict[str, Any]) -> None:
+        doc_id = career["id"]
+        terms = Counter(career_terms(career))
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = sum(terms.values())
+        self._doc_keys[doc_id] = career["key"]
+        self._total_length += self._doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+
+    def _discard(self, doc_id: int) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._doc_keys.pop(doc_id, None)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Iterable[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)."""
+    fused: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+# Global instance, kept current through the career catalog
+bm25_index = BM25Index()
+career_catalog.subscribe(bm25_index)
@@ -1,57 +1,92 @@
 # Placeholder for LLM service integration (OpenAI, HuggingFace, etc.) # backend/app/services/llm.py
 import os
-import json
-from typing import List, Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import ChatPromptTemplate
+import time
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.models import InterviewResult
+from app.services.llm_dispatcher import Priority, llm_dispatcher
+from app.services.llm_cache import create_response_cache, response_cache_key
+from app.services.prompts import (
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    get_chain,
+    get_prompt,
+    parse_json_response,
+)
+from app.services.semantic_cache import SemanticCache, interest_text
+from app.services.transcript import TranscriptSummary, compact_transcript, normalize_analysis
 from datetime import datetime
 
 load_dotenv()
 
 class LLMService:
     def __init__(self):
-        self._llm = None
+        # Opt-in per method via _invoke_cached; None when LLM_CACHE_BACKEND=none
+        self.response_cache = create_response_cache()
+        # Interest-only prompts reuse replies for similar interests
+        self.question_caches = {
+            "interview_questions": SemanticCache(),
+            "initial_question": SemanticCache()
+        }
     
-    def _get_llm(self):
-        """Lazy initialization of the LLM."""
-        if self._llm is None:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key or api_key == "your-gemini-api-key-here":
-                raise ValueError("GOOGLE_API_KEY environment variable is required. Please set it in your .env file.")
-            
-            self._llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash",
-                google_api_key=api_key,
-                temperature=0.7,
-                max_tokens=1000
-            )
-        return self._llm
+    async def _invoke_cached(
+        self,
+        prompt_name: str,
+        inputs: Dict[str, Any],
+        parse: Callable[[str], Any],
+        semantic_cache: Optional[SemanticCache] = None,
+        semantic_text: str = ""
+    ) -> Any:
+        """Run a registered prompt and parse the reply, serving repeats from the response cache.
+
+        With a semantic cache, a reply for a similar `semantic_text` is reused
+        when there is no exact hit. Only parsed results are cached, so a
+        malformed reply is retried next time.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = response_cache_key(get_prompt(prompt_name).version, LLM_MODEL, LLM_TEMPERATURE, inputs)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if semantic_cache is not None and semantic_text:
+            match = semantic_cache.lookup(semantic_text)
+            if match is not None:
+                return match[0]
+
+        chain = get_chain(prompt_name)
+        started = time.perf_counter()
+        response = await llm_dispatcher.run(lambda: chain.ainvoke(inputs), Priority.INTERACTIVE)
+        result = parse(response.content)
+        if key is not None:
+            self.response_cache.set(key, result, time.perf_counter() - started)
+        if semantic_cache is not None and semantic_text:
+            semantic_cache.add(semantic_text, result)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            **(self.response_cache.stats() if self.response_cache else {"backend": "none"}),
+            "semantic": {name: cache.stats() for name, cache in self.question_caches.items()}
+        }
 
     async def generate_interview_questions(self, interests: str) -> List[str]:
         """Generate custom AI questions based on student interests."""
         try:
-            llm = self._get_llm()
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert career counselor. Based on a student's interests, 
-                generate 5-7 thoughtful, open-ended questions to better understand their:
-                1. Learning style and preferences
-                2. Motivation and goals  
-                3. Problem-solving approach
-                4. Communication style
-                5. Technical aptitude
-                
-                Questions should be conversational and help reveal both technical and soft skills.
-                Return only the questions, one per line, without numbering."""),
-                ("human", "Student interests: {interests}")
-            ])
-            chain = prompt | llm
-            response = await chain.ainvoke({"interests": interests})
-            questions = response.content.strip().split('\n')
-            return [q.strip() for q in questions if q.strip()]
+            def parse(content: str) -> List[str]:
+                questions = content.strip().split('\n')
+                return [q.strip() for q in questions if q.strip()]
+
+            return await self._invoke_cached(
+                "interview_questions",
+                {"interests": interests},
+                parse,
+                semantic_cache=self.question_caches["interview_questions"],
+                semantic_text=interest_text(interests)
+            )
         except Exception as e:
             print(f"Error generating questions: {str(e)}")
             # Return fallback questions
@@ -66,45 +101,17 @@ class LLMService:
     async def infer_skills_from_responses(self, interests: str, responses: List[str]) -> Dict[str, Any]:
         """Analyze student responses and infer technical and soft skills."""
         try:
-            llm = self._get_llm()
             combined_responses = "\n".join([f"Response {i+1}: {response}" for i, response in enumerate(responses)])
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert career analyst. Analyze student responses and identify:
-                1. Technical skills (programming, analysis, design, etc.)
-                2. Soft skills (leadership, communication, problem-solving, etc.)
-                3. Learning preferences (visual, hands-on, theoretical, etc.)
-                4. Career interests and motivations
-                
-                Return a JSON object with this structure:
-                {{
-                    \"technical_skills\": [\"skill1\", \"skill2\"],
-                    \"soft_skills\": [\"skill1\", \"skill2\"], 
-                    \"learning_style\": \"description\",
-                    \"career_interests\": [\"interest1\", \"interest2\"],
-                    \"confidence_level\": \"high/medium/low\"
-                }}"""),
-                ("human", """Student's initial interests: {interests}
-                
-                Student's interview responses:
-                {responses}""")
-            ])
-            chain = prompt | llm
-            response = await chain.ainvoke({
+            chain = get_chain("skill_analysis")
+            inputs = {
                 "interests": interests,
                 "responses": combined_responses
-            })
+            }
+            # Whole-interview analysis yields to students waiting on their next question
+            response = await llm_dispatcher.run(lambda: chain.ainvoke(inputs), Priority.BATCH)
             try:
-                # Extract JSON from response
-                content = response.content.strip()
-                if content.startswith("```json"):
-                    content = content[7:-3]  # Remove ```json and ```
-                elif content.startswith("```"):
-                    content = content[3:-3]  # Remove ``` and ```
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError as e:
-                print(f"JSON parsing error: {str(e)}")
-                print(f"Raw response: {response.content}")
+                return normalize_analysis(parse_json_response(response.content))
+            except ValueError:
                 # Fallback if JSON parsing fails
                 return {
                     "technical_skills": ["problem-solving"],
@@ -130,77 +137,27 @@ class LLMService:
         previous_questions: list, 
         previous_responses: list,
         current_question_number: int,
-        total_questions: int = 8
+        total_questions: int = 8,
+        transcript_summary: Optional[TranscriptSummary] = None
     ) -> dict:
-        """Generate a dynamic question based on user's previous answers."""
-        try:
-            llm = self._get_llm()
-            
-            # Build context from previous Q&A
-            qa_context = ""
-            for i, (q, r) in enumerate(zip(previous_questions, previous_responses)):
-                qa_context += f"Q{i+1}: {q}\nA{i+1}: {r}\n\n"
-            
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are analyzing the skills of a Pakistani college student based on their interests. Your job is to understand what skills they might have related to their interests - not to give career advice.
-
-                How to ask questions:
-                1. Use simple English that Pakistani college students understand
-                2. Ask questions that connect to their interests they mentioned
-                3. Build on their previous answers to find out more about their abilities
-                4. Think about what Pakistani students actually do in college (assignments, presentations, group work)
-                5. Ask about real experiences they might have had related to their interests
-                6. Find out how they learned about their interests and what they did
-                7. Questions should be 15-20 words and easy to understand
-                8. Be friendly like talking to a junior
-                9. For the last question, ask something that wraps up their skills
-
-                Based on their interests, explore:
-                - What they have actually done related to their interests (projects, assignments, activities)
-                - How they learned about this interest (online, books, friends, family)
-                - What they are good at when doing things related to their interests
-                - Any problems they solved or challenges they faced in this area
-                - If they helped others or worked with classmates on anything related
-                - What tools, apps, or methods they used for their interests
-                - How they practice or improve in areas they are interested in
-                - What comes naturally to them in their area of interest
-
-                Return a JSON object with this structure:
-                {{
-                    "question": "The next question to ask",
-                    "is_final_question": true/false
-                }}"""),
-                ("human", """Student's initial interests: {interests}
-
-Previous Q&A:
-{qa_context}
+        """Generate a dynamic question based on user's previous answers.
 
-Current question number: {current_question_number} of {total_questions}
-
-Generate the next question:""")
-            ])
+        Older turns are compacted into `transcript_summary`, which is updated
+        in place so a caller that stores it only folds each turn once.
+        """
+        try:
+            # Build context from previous Q&A: recent turns verbatim, older ones summarized
+            qa_context, _ = compact_transcript(previous_questions, previous_responses, transcript_summary)
             
-            chain = prompt | llm
-            response = await chain.ainvoke({
+            chain = get_chain("dynamic_question")
+            inputs = {
                 "interests": interests,
                 "qa_context": qa_context,
                 "current_question_number": current_question_number,
                 "total_questions": total_questions
-            })
-            
-            try:
-                content = response.content.strip()
-                if content.startswith("```json"):
-                    content = content[7:-3]
-                elif content.startswith("```"):
-                    content = content[3:-3]
-                
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError as json_err:
-                print(f"JSON parsing error: {str(json_err)}")
-                print(f"Raw response: {response.content}")
-                raise ValueError(f"Failed to parse AI response: {str(json_err)}")
+            }
+            response = await llm_dispatcher.run(lambda: chain.ainvoke(inputs), Priority.INTERACTIVE)
+            return parse_json_response(response.content)
         except Exception as e:
             print(f"Error generating dynamic question: {str(e)}")
             # Raise the complete error instead of using fallback
@@ -209,39 +166,13 @@ Generate the next question:""")
     async def generate_initial_question(self, interests: str) -> dict:
         """Generate the first question based on user's interests."""
         try:
-            llm = self._get_llm()
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert career counselor starting a dynamic interview. 
-                Based on the student's initial interests, generate the first question. 
-
-                Guidelines:
-                1. Be warm and welcoming.  
-                2. Use short, simple English (max 20 words).  
-                3. Ask only **one clear question with some example recommendation so that user can understand more effectively**.  
-                4. Focus on understanding their motivation behind the stated interest.  
-                5. Avoid difficult or technical words.  
-
-                Return a JSON object with this structure:
-                {{
-                    "question": "The first question to ask",
-                    "is_final_question": false
-                }}"""),
-                ("human", "Student's initial interests: {interests}")
-            ])
-            chain = prompt | llm
-            response = await chain.ainvoke({"interests": interests})
-            try:
-                content = response.content.strip()
-                if content.startswith("```json"):
-                    content = content[7:-3]
-                elif content.startswith("```"):
-                    content = content[3:-3]
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError as json_err:
-                print(f"JSON parsing error: {str(json_err)}")
-                print(f"Raw response: {response.content}")
-                raise ValueError(f"Failed to parse AI response: {str(json_err)}")
+            return await self._invoke_cached(
+                "initial_question",
+                {"interests": interests},
+                parse_json_response,
+                semantic_cache=self.question_caches["initial_question"],
+                semantic_text=interest_text(interests)
+            )
         except Exception as e:
             print(f"Error generating initial question: {str(e)}")
             # Raise the complete error instead of using fallback
@@ -251,9 +182,14 @@ Generate the next question:""")
         self, 
         session: AsyncSession, 
         student_id: int, 
-        analysis: Dict[str, Any]
+        analysis: Dict[str, Any],
+        commit: bool = True
     ) -> None:
-        """Save or update interview result for a student."""
+        """Save or update interview result for a student.
+
+        With commit=False the change is only flushed, so the caller can
+        commit it together with other writes.
+        """
         try:
             # Check if result already exists
             result = await session.execute(
@@ -281,7 +217,10 @@ Generate the next question:""")
                 )
                 session.add(new_result)
             
-            await session.commit()
+            if commit:
+                await session.commit()
+            else:
+                await session.flush()
         except Exception as e:
             await session.rollback()
             raise e
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from app.core.cache import LRUCache
+
+
+def response_cache_key(version: str, model: str, temperature: float, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"version": version, "model": model, "temperature": temperature, "inputs": inputs},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseBackend:
+    """In-process LRU backend."""
+
+    def __init__(self, max_size: int = 512, ttl: Optional[float] = None):
+        self._cache = LRUCache(max_size, ttl=ttl)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._cache.set(key, entry)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteResponseBackend:
+    """SQLite backend, shared by every worker on the host and kept across restarts."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(row[0])
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry), now, now + self.ttl if self.ttl is not None else None),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()
+        return {"backend": "sqlite", "path": self.path, "size": size, "ttl": self.ttl}
+
+
+class LLMResponseCache:
+    """Cache of parsed LLM responses with hit and saved-latency counters.
+
+    Entries store the latency of the call that produced them, so each hit
+    adds that latency to `saved_seconds`.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.get("latency", 0.0)
+        return entry["value"]
+
+    def set(self, key: str, value: Any, latency: float) -> None:
+        self.backend.set(key, {"value": value, "latency": latency})
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+def create_response_cache() -> Optional[LLMResponseCache]:
+    """Build the cache configured by LLM_CACHE_BACKEND (memory, sqlite or none)."""
+    backend = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    ttl = float(os.getenv("LLM_CACHE_TTL", "86400")) or None
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return LLMResponseCache(SQLiteResponseBackend(os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"), ttl=ttl))
+    return LLMResponseCache(MemoryResponseBackend(int(os.getenv("LLM_CACHE_SIZE", "512")), ttl=ttl))
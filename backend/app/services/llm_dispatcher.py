@@ -0,0 +1,226 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+# Provider quota; the token bucket refills at this rate
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+# Seconds between multiplicative decreases, so one burst of 429s halves the limit once
+BACKOFF_COOLDOWN = 2.0
+
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504}
+OVERLOAD_ERROR_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "BadGateway",
+    "GatewayTimeout",
+}
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0  # a student is waiting on the next interview question
+    STANDARD = 1  # career ranking
+    BATCH = 2  # whole-interview analysis
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an LLM error means the provider is rate limiting or overloaded."""
+    for attr in ("status_code", "code", "http_status"):
+        code = getattr(error, attr, None)
+        code = getattr(code, "value", code)
+        if isinstance(code, int) and code in OVERLOAD_STATUS_CODES:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in OVERLOAD_STATUS_CODES:
+        return True
+    return type(error).__name__ in OVERLOAD_ERROR_NAMES
+
+
+class TokenBucket:
+    """Request-rate limiter: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self.throttled = 0
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # One waiter at a time, so tokens go out in arrival (priority) order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.throttled += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class _PriorityStats:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.model_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait": round(self.queue_wait / finished, 4) if finished else 0.0,
+            "max_queue_wait": round(self.max_queue_wait, 4),
+            "avg_model_time": round(self.model_time / finished, 4) if finished else 0.0,
+        }
+
+
+class LLMDispatcher:
+    """Process-wide gate in front of every LLM call.
+
+    Calls wait in a priority queue for one of `limit` slots, then for a
+    token from the rate bucket. The slot limit adapts AIMD-style: +1 per
+    window of successful calls, halved when the provider answers 429/5xx.
+    Queue wait (slot + rate limit) and model time are metered separately.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        min_concurrency: int = LLM_MIN_CONCURRENCY,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        burst: int = LLM_BURST,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.limit = float(max_concurrency)
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_backoff = 0.0
+        self.backoffs = 0
+        self._stats = {priority: _PriorityStats() for priority in Priority}
+
+    async def run(self, fn: Callable[[], Awaitable[Any]], priority: Priority = Priority.STANDARD) -> Any:
+        """Await `fn()` once a slot and a rate token are available."""
+        async with self.slot(priority):
+            return await fn()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.STANDARD):
+        """Hold one LLM slot for the body, e.g. for the length of a stream."""
+        stats = self._stats[priority]
+        stats.submitted += 1
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self._release()
+            raise
+
+        started = time.monotonic()
+        wait = started - queued_at
+        stats.queue_wait += wait
+        stats.max_queue_wait = max(stats.max_queue_wait, wait)
+        try:
+            yield
+        except BaseException as e:
+            stats.failed += 1
+            if isinstance(e, Exception) and is_overload_error(e):
+                self._decrease()
+            raise
+        else:
+            stats.completed += 1
+            self._increase()
+        finally:
+            stats.model_time += time.monotonic() - started
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": sum(1 for _, _, waiter in self._waiters if not waiter.done()),
+            "backoffs": self.backoffs,
+            "rate_per_second": round(self.bucket.rate, 4),
+            "rate_tokens": round(self.bucket.tokens, 2),
+            "throttled": self.bucket.throttled,
+            "priorities": {priority.name.lower(): stats.to_dict() for priority, stats in self._stats.items()},
+        }
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._active < int(self.limit) and not self._waiters:
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we were cancelled; hand it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._active < int(self.limit):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._active += 1
+            waiter.set_result(None)
+
+    def _increase(self) -> None:
+        if self.limit < self.max_concurrency:
+            # About +1 after a full window of successes at the current limit
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_backoff < BACKOFF_COOLDOWN:
+            return
+        self._last_backoff = now
+        self.backoffs += 1
+        self.limit = max(float(self.min_concurrency), self.limit / 2)
+        print(f"⚠️  LLM provider overloaded, concurrency limit now {int(self.limit)}")
+
+
+# Global instance shared by every LLM caller
+llm_dispatcher = LLMDispatcher()
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+
+class StageMetrics:
+    """Process-wide timing counters per stage name."""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float, failed: bool = False) -> None:
+        stage = self._stages.setdefault(name, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        stage["count"] += 1
+        stage["errors"] += int(failed)
+        stage["total"] += seconds
+        stage["max"] = max(stage["max"], seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "count": int(stage["count"]),
+                "errors": int(stage["errors"]),
+                "avg_ms": round(1000 * stage["total"] / stage["count"], 1) if stage["count"] else 0.0,
+                "max_ms": round(1000 * stage["max"], 1),
+            }
+            for name, stage in self._stages.items()
+        }
+
+
+class StagePipeline:
+    """Runs the stages of one request under a shared deadline and times each one.
+
+    Independent stages go through `gather` so the request takes as long as
+    its critical path; work the response doesn't need goes to `background`.
+    """
+
+    def __init__(self, name: str, deadline: float, metrics: Optional[StageMetrics] = None):
+        self.name = name
+        self.deadline = deadline
+        self.metrics = metrics or stage_metrics
+        self.timings: Dict[str, float] = {}
+        self._started = time.monotonic()
+
+    @property
+    def remaining(self) -> float:
+        return max(self.deadline - (time.monotonic() - self._started), 0.0)
+
+    async def run(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """Await one stage, bounded by what is left of the deadline."""
+        started = time.monotonic()
+        failed = False
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.timings[stage] = elapsed
+            self.metrics.record(f"{self.name}.{stage}", elapsed, failed)
+
+    async def gather(self, **stages: Awaitable[Any]) -> Dict[str, Any]:
+        """Run independent stages concurrently; returns their results by name.
+
+        If any stage fails or times out, the others are cancelled and awaited
+        before the error propagates, so no stage outlives the request (and
+        its database session).
+        """
+        tasks = {stage: asyncio.ensure_future(self.run(stage, awaitable)) for stage, awaitable in stages.items()}
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return {stage: task.result() for stage, task in tasks.items()}
+
+    def background(self, stage: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        """Run `fn()` after the response path, outside the deadline. Errors are logged."""
+        task = asyncio.create_task(self._run_background(stage, fn))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    def server_timing(self) -> str:
+        """Stage timings as a Server-Timing header value."""
+        timings = dict(self.timings, total=time.monotonic() - self._started)
+        return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+    async def _run_background(self, stage: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        started = time.monotonic()
+        failed = False
+        try:
+            await fn()
+        except Exception as e:
+            failed = True
+            print(f"❌ Background stage {self.name}.{stage} failed: {str(e)}")
+        finally:
+            self.metrics.record(f"{self.name}.{stage}", time.monotonic() - started, failed)
+
+
+async def drain_background_tasks(timeout: float = 10.0) -> None:
+    """Wait for queued background stages, e.g. at shutdown."""
+    if _background_tasks:
+        await asyncio.wait(set(_background_tasks), timeout=timeout)
+
+
+_background_tasks: Set[asyncio.Task] = set()
+
+# Global instance
+stage_metrics = StageMetrics()
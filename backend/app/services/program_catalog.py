@@ -0,0 +1,87 @@
+import hashlib
+import json
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.catalog import CatalogListener, career_catalog
+
+PROGRAMS_MESSAGE = "Programs extracted from all careers"
+
+
+def flatten_programs(career: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """A career's programs, each tagged with the career it belongs to."""
+    flattened = []
+    for program in career.get("programs") or []:
+        # Programs are stored as titles; older rows may hold objects
+        fields = dict(program) if isinstance(program, dict) else {"title": program}
+        flattened.append({**fields, "career_id": career["id"], "career_title": career["title"]})
+    return flattened
+
+
+def _dumps(value: Any) -> str:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+class ProgramCatalog(CatalogListener):
+    """The /programs/all response, materialized from the career catalog.
+
+    Each career's flattened programs are kept as one serialized JSON
+    fragment, so a career edit re-serializes only that career. The full
+    payload is joined from the fragments on the first read after a change
+    and then served as bytes until the next one.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[int, Tuple[str, int]] = {}
+        self._payload: Optional[bytes] = None
+        self._version = 0
+        self._etag = ""
+        self._lock = Lock()
+        self.loaded = False
+        self.builds = 0
+
+    def rebuild(self, careers: List[Dict[str, Any]]) -> None:
+        fragments = {career["id"]: self._fragment(career) for career in careers}
+        with self._lock:
+            self._fragments = fragments
+            self._payload = None
+            self.loaded = True
+
+    def upsert(self, career: Dict[str, Any]) -> None:
+        fragment = self._fragment(career)
+        with self._lock:
+            self._fragments[career["id"]] = fragment
+            self._payload = None
+
+    def remove(self, career_id: int) -> None:
+        with self._lock:
+            self._fragments.pop(career_id, None)
+            self._payload = None
+
+    def payload(self) -> Tuple[bytes, int, str]:
+        """The serialized response, the catalog version it reflects and its ETag.
+
+        The ETag hashes the content, so it also matches across workers and restarts.
+        """
+        with self._lock:
+            if self._payload is None:
+                parts = [self._fragments[career_id] for career_id in sorted(self._fragments)]
+                body = ",".join(fragment for fragment, count in parts if count)
+                total = sum(count for _, count in parts)
+                self._payload = (
+                    f'{{"programs":[{body}],"total_count":{total},"message":{_dumps(PROGRAMS_MESSAGE)}}}'
+                ).encode("utf-8")
+                self._version = career_catalog.version
+                self._etag = f'"{hashlib.sha1(self._payload).hexdigest()[:16]}"'
+                self.builds += 1
+            return self._payload, self._version, self._etag
+
+    def _fragment(self, career: Dict[str, Any]) -> Tuple[str, int]:
+        programs = flatten_programs(career)
+        return ",".join(_dumps(program) for program in programs), len(programs)
+
+
+# Global instance, kept current through the career catalog
+program_catalog = ProgramCatalog()
+career_catalog.subscribe(program_catalog)
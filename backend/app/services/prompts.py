@@ -0,0 +1,276 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from langchain.prompts import ChatPromptTemplate
+
+from app.services.providers import create_chat_model
+
+LLM_MODEL = "gemini-1.5-flash"
+LLM_TEMPERATURE = 0.7
+LLM_MAX_TOKENS = 1000
+
+
+INTERVIEW_QUESTIONS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert career counselor. Based on a student's interests, 
+    generate 5-7 thoughtful, open-ended questions to better understand their:
+    1. Learning style and preferences
+    2. Motivation and goals  
+    3. Problem-solving approach
+    4. Communication style
+    5. Technical aptitude
+    
+    Questions should be conversational and help reveal both technical and soft skills.
+    Return only the questions, one per line, without numbering."""),
+    ("human", "Student interests: {interests}")
+])
+
+SKILL_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert career analyst. Analyze student responses and identify:
+    1. Technical skills (programming, analysis, design, etc.)
+    2. Soft skills (leadership, communication, problem-solving, etc.)
+    3. Learning preferences (visual, hands-on, theoretical, etc.)
+    4. Career interests and motivations
+    
+    Return a JSON object with this structure:
+    {{
+        \"technical_skills\": [\"skill1\", \"skill2\"],
+        \"soft_skills\": [\"skill1\", \"skill2\"], 
+        \"learning_style\": \"description\",
+        \"career_interests\": [\"interest1\", \"interest2\"],
+        \"confidence_level\": \"high/medium/low\"
+    }}"""),
+    ("human", """Student's initial interests: {interests}
+    
+    Student's interview responses:
+    {responses}""")
+])
+
+DYNAMIC_QUESTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are analyzing the skills of a Pakistani college student based on their interests. Your job is to understand what skills they might have related to their interests - not to give career advice.
+
+    How to ask questions:
+    1. Use simple English that Pakistani college students understand
+    2. Ask questions that connect to their interests they mentioned
+    3. Build on their previous answers to find out more about their abilities
+    4. Think about what Pakistani students actually do in college (assignments, presentations, group work)
+    5. Ask about real experiences they might have had related to their interests
+    6. Find out how they learned about their interests and what they did
+    7. Questions should be 15-20 words and easy to understand
+    8. Be friendly like talking to a junior
+    9. For the last question, ask something that wraps up their skills
+
+    Based on their interests, explore:
+    - What they have actually done related to their interests (projects, assignments, activities)
+    - How they learned about this interest (online, books, friends, family)
+    - What they are good at when doing things related to their interests
+    - Any problems they solved or challenges they faced in this area
+    - If they helped others or worked with classmates on anything related
+    - What tools, apps, or methods they used for their interests
+    - How they practice or improve in areas they are interested in
+    - What comes naturally to them in their area of interest
+
+    Return a JSON object with this structure:
+    {{
+        "question": "The next question to ask",
+        "is_final_question": true/false
+    }}"""),
+    ("human", """Student's initial interests: {interests}
+
+Previous Q&A:
+{qa_context}
+
+Current question number: {current_question_number} of {total_questions}
+
+Generate the next question:""")
+])
+
+INITIAL_QUESTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert career counselor starting a dynamic interview. 
+    Based on the student's initial interests, generate the first question. 
+
+    Guidelines:
+    1. Be warm and welcoming.  
+    2. Use short, simple English (max 20 words).  
+    3. Ask only **one clear question with some example recommendation so that user can understand more effectively**.  
+    4. Focus on understanding their motivation behind the stated interest.  
+    5. Avoid difficult or technical words.  
+
+    Return a JSON object with this structure:
+    {{
+        "question": "The first question to ask",
+        "is_final_question": false
+    }}"""),
+    ("human", "Student's initial interests: {interests}")
+])
+
+CAREER_RANKING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert career counselor. Based on a student's interview analysis and a list of potential careers from a vector database, select the top 5 most suitable careers.
+
+    Guidelines:
+    1. Consider the student's technical skills, soft skills, learning style, and career interests
+    2. Match careers to the student's profile and preferences
+    3. Consider the vector similarity scores but don't rely solely on them
+    4. Provide reasoning for each recommendation
+    5. Rank careers from most suitable to least suitable
+    6. Additionally, include a concise current market and job outlook for Pakistan for each career (demand trends, key cities/sectors hiring, typical entry-level roles, indicative salary ranges in PKR when possible, and short note on growth outlook). Keep it factual and brief.
+
+    Return a JSON object with this structure:
+    {{
+        "recommended_careers": [
+            {{
+                "title": "Career Title",
+                "description": "Brief description",
+                "match_reason": "Why this career matches the student",
+                "confidence_score": 0.95,
+                "required_skills": ["skill1", "skill2"],
+                "learning_path": "Suggested learning path",
+                "market_job_analysis_pakistan": "Concise Pakistan-specific market and job analysis"
+            }}
+        ]
+    }}"""),
+    ("human", """Student Interview Analysis:
+Technical Skills: {technical_skills}
+Soft Skills: {soft_skills}
+Learning Style: {learning_style}
+Career Interests: {career_interests}
+Confidence Level: {confidence_level}
+
+Available Careers from Vector Database:
+{career_data}
+
+Select only the top 5 most suitable careers:""")
+])
+
+ANALYZE_AND_RECOMMEND_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert career analyst and counselor. From a student's interview you will do two things in one answer.
+
+    First, analyze the responses and identify:
+    1. Technical skills (programming, analysis, design, etc.)
+    2. Soft skills (leadership, communication, problem-solving, etc.)
+    3. Learning preferences (visual, hands-on, theoretical, etc.)
+    4. Career interests and motivations
+
+    Then, using that analysis, select the top 5 most suitable careers from the candidate list, ranked from most to least suitable, with reasoning for each. Consider the vector similarity scores but don't rely solely on them. Include a concise current market and job outlook for Pakistan for each career (demand trends, key cities/sectors hiring, typical entry-level roles, indicative salary ranges in PKR when possible, and short note on growth outlook).
+
+    Return a JSON object with this structure:
+    {{
+        "analysis": {{
+            "technical_skills": ["skill1", "skill2"],
+            "soft_skills": ["skill1", "skill2"],
+            "learning_style": "description",
+            "career_interests": ["interest1", "interest2"],
+            "confidence_level": "high/medium/low"
+        }},
+        "recommended_careers": [
+            {{
+                "title": "Career Title",
+                "description": "Brief description",
+                "match_reason": "Why this career matches the student",
+                "confidence_score": 0.95,
+                "required_skills": ["skill1", "skill2"],
+                "learning_path": "Suggested learning path",
+                "market_job_analysis_pakistan": "Concise Pakistan-specific market and job analysis"
+            }}
+        ]
+    }}"""),
+    ("human", """Student's initial interests: {interests}
+
+Student's interview responses:
+{responses}
+
+Candidate careers:
+{career_data}
+
+Return the analysis and the top 5 careers:""")
+])
+
+
+@dataclass(frozen=True)
+class RegisteredPrompt:
+    """A prompt template built once at import, with a hash of its messages as its version."""
+
+    name: str
+    template: ChatPromptTemplate
+    version: str
+
+
+def prompt_version(template: ChatPromptTemplate) -> str:
+    """Short hash of a template's messages, so editing a prompt changes its identity."""
+    parts = []
+    for message in template.messages:
+        text = getattr(getattr(message, "prompt", None), "template", None)
+        parts.append(f"{type(message).__name__}:{text if text is not None else repr(message)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+PROMPTS: Dict[str, RegisteredPrompt] = {
+    name: RegisteredPrompt(name, template, prompt_version(template))
+    for name, template in {
+        "interview_questions": INTERVIEW_QUESTIONS_PROMPT,
+        "skill_analysis": SKILL_ANALYSIS_PROMPT,
+        "dynamic_question": DYNAMIC_QUESTION_PROMPT,
+        "initial_question": INITIAL_QUESTION_PROMPT,
+        "career_ranking": CAREER_RANKING_PROMPT,
+        "analyze_and_recommend": ANALYZE_AND_RECOMMEND_PROMPT,
+    }.items()
+}
+
+_models: Dict[Tuple[str, float, int], Any] = {}
+_chains: Dict[Tuple[str, str, float, int], Any] = {}
+_lock = Lock()
+
+
+def get_prompt(name: str) -> RegisteredPrompt:
+    return PROMPTS[name]
+
+
+def get_chat_model(
+    model: str = LLM_MODEL,
+    temperature: float = LLM_TEMPERATURE,
+    max_tokens: int = LLM_MAX_TOKENS
+):
+    """One shared client per model configuration, so HTTP connections are reused."""
+    key = (model, temperature, max_tokens)
+    with _lock:
+        if key not in _models:
+            _models[key] = create_chat_model(model, temperature, max_tokens=max_tokens)
+        return _models[key]
+
+
+def get_chain(
+    name: str,
+    model: str = LLM_MODEL,
+    temperature: float = LLM_TEMPERATURE,
+    max_tokens: int = LLM_MAX_TOKENS
+):
+    """The registered prompt piped into the shared model, composed once per configuration."""
+    key = (name, model, temperature, max_tokens)
+    chain = _chains.get(key)
+    if chain is None:
+        chain = PROMPTS[name].template | get_chat_model(model, temperature, max_tokens)
+        with _lock:
+            _chains.setdefault(key, chain)
+    return chain
+
+
+def parse_json_response(content: str) -> Any:
+    """Parse a JSON reply, tolerating a surrounding markdown code fence.
+
+    Raises ValueError (after logging the raw reply) if it is not valid JSON.
+    """
+    text = (content or "").strip()
+    if text.startswith("```"):
+        text = text[3:]
+        if text.lower().startswith("json"):
+            text = text[4:]
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as json_err:
+        print(f"JSON parsing error: {str(json_err)}")
+        print(f"Raw response: {content}")
+        raise ValueError(f"Failed to parse AI response: {str(json_err)}")
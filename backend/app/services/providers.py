@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.core.config import settings
+from app.services.vector_search import LocalVectorIndex
+
+# Characters per streamed chunk from the fake model
+FAKE_STREAM_CHUNK = 40
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recorded response for a prompt."""
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Draw a latency in seconds from a spec like "fixed:0.5", "uniform:0.2:1.5",
+    "normal:0.8:0.2" or "lognormal:-0.4:0.5"."""
+    kind, *params = (spec or "fixed:0").split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        delay = values[0] if values else 0.0
+    elif kind == "uniform":
+        delay = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        delay = rng.gauss(values[0], values[1])
+    elif kind == "lognormal":
+        delay = rng.lognormvariate(values[0], values[1])
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return max(delay, 0.0)
+
+
+def prompt_hash(messages: List[BaseMessage], **params: Any) -> str:
+    """Stable hash of the rendered messages plus model parameters."""
+    payload = json.dumps(
+        {
+            "messages": [[message.type, message.content] for message in messages],
+            "params": params,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline stand-in for Gemini.
+
+    Recognizes the app's prompts and answers each with canned JSON (or text)
+    in the shape the caller parses, after a delay drawn from `latency`. The
+    reply and the delay are seeded by the prompt hash, so runs are
+    reproducible.
+    """
+
+    latency: str = "fixed:0"
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-career-compass"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        content, delay = self._reply(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        content, delay = self._reply(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        content, delay = self._reply(messages)
+        pieces = _split(content)
+        for piece in pieces:
+            time.sleep(delay / len(pieces))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content, delay = self._reply(messages)
+        pieces = _split(content)
+        for piece in pieces:
+            await asyncio.sleep(delay / len(pieces))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    def _reply(self, messages: List[BaseMessage]):
+        digest = prompt_hash(messages, seed=self.seed)
+        rng = random.Random(digest)
+        text = "\n".join(str(message.content) for message in messages)
+        return _canned_reply(text, rng), sample_latency(self.latency, rng)
+
+
+class CassetteChatModel(BaseChatModel):
+    """Record/replay wrapper keyed by prompt hash.
+
+    In "record" mode every call goes to `inner` and the reply is written to
+    `<cassette_dir>/<prompt hash>.json`; in "replay" mode replies are served
+    from those files and a missing one raises CassetteMissError.
+    """
+
+    inner: Optional[BaseChatModel] = None
+    cassette_dir: str = "cassettes"
+    mode: str = "replay"
+    model_name: str = ""
+    temperature: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages)
+        if self.mode == "replay":
+            return _result(self._load(key))
+        response = self.inner.invoke(messages, stop=stop)
+        self._save(key, messages, response.content)
+        return _result(response.content)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages)
+        if self.mode == "replay":
+            return _result(self._load(key))
+        response = await self.inner.ainvoke(messages, stop=stop)
+        self._save(key, messages, response.content)
+        return _result(response.content)
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._key(messages)
+        if self.mode == "replay":
+            for piece in _split(self._load(key)):
+                yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            return
+        content = ""
+        async for chunk in self.inner.astream(messages, stop=stop):
+            content += chunk.content
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk.content))
+        self._save(key, messages, content)
+
+    def _key(self, messages: List[BaseMessage]) -> str:
+        return prompt_hash(messages, model=self.model_name, temperature=self.temperature)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cassette_dir, f"{key}.json")
+
+    def _load(self, key: str) -> str:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            raise CassetteMissError(f"No recorded LLM response for prompt {key[:12]} in {self.cassette_dir}")
+
+    def _save(self, key: str, messages: List[BaseMessage], content: str) -> None:
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "prompt_hash": key,
+                    "model": self.model_name,
+                    "temperature": self.temperature,
+                    "messages": [[message.type, message.content] for message in messages],
+                    "response": content,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, self._path(key))
+
+
+class FakeVectorIndex:
+    """Pinecone-shaped index over the local career index with simulated network latency.
+
+    Blocking like the sync Pinecone client, so it goes through the same
+    thread-pool path in AsyncVectorStore.
+    """
+
+    def __init__(self, index: LocalVectorIndex, latency: str = "fixed:0", seed: int = 0):
+        self.index = index
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+    def query(self, vector, top_k: int = 10, include_metadata: bool = False, **kwargs):
+        time.sleep(sample_latency(self.latency, self._rng))
+        return self.index.query(vector=vector, top_k=top_k, include_metadata=include_metadata)
+
+    def upsert(self, vectors, **kwargs):
+        time.sleep(sample_latency(self.latency, self._rng))
+        return self.index.upsert(vectors)
+
+    def delete(self, ids, **kwargs):
+        time.sleep(sample_latency(self.latency, self._rng))
+        return self.index.delete(ids)
+
+
+def create_chat_model(model: str, temperature: float, max_tokens: int = 1000) -> BaseChatModel:
+    """Build the chat model selected by LLM_PROVIDER: gemini, fake, record or replay."""
+    provider = settings.LLM_PROVIDER
+    if provider == "fake":
+        return FakeChatModel(latency=settings.FAKE_LLM_LATENCY)
+    if provider == "replay":
+        return CassetteChatModel(
+            cassette_dir=settings.LLM_CASSETTE_DIR, mode="replay", model_name=model, temperature=temperature
+        )
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key or api_key == "your-gemini-api-key-here":
+        raise ValueError("GOOGLE_API_KEY environment variable is required. Please set it in your .env file.")
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    llm = ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=api_key,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    if provider == "record":
+        return CassetteChatModel(
+            inner=llm, cassette_dir=settings.LLM_CASSETTE_DIR, mode="record", model_name=model, temperature=temperature
+        )
+    return llm
+
+
+def _result(content: str) -> ChatResult:
+    return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def _split(content: str) -> List[str]:
+    return [content[i:i + FAKE_STREAM_CHUNK] for i in range(0, len(content), FAKE_STREAM_CHUNK)] or [""]
+
+
+_FAKE_QUESTIONS = [
+    "What is one project or assignment related to your interest that you enjoyed working on?",
+    "How did you first get interested in this, and what have you learned on your own?",
+    "Tell me about a problem you solved in this area and how you solved it.",
+    "When you work with classmates on this, what role do you usually take?",
+    "Which tools, apps or websites do you use most when you practice this?",
+    "What part of this comes easily to you that your friends find hard?",
+    "How do you usually learn something new here - videos, books, or trying it yourself?",
+    "Looking back at everything you told me, what skill are you most proud of?",
+]
+_CAREER_LINE_RE = re.compile(r"^Career \d+: (.+)$", re.MULTILINE)
+_QUESTION_NUMBER_RE = re.compile(r"Current question number: (\d+) of (\d+)")
+
+
+def _canned_reply(text: str, rng: random.Random) -> str:
+    if '"recommended_careers"' in text:
+        titles = _CAREER_LINE_RE.findall(text)[:5] or ["Software Engineer"]
+        reply = {
+            "recommended_careers": [
+                {
+                    "title": title.strip(),
+                    "description": f"Works as a {title.strip()}.",
+                    "match_reason": "Matches the skills and interests in the interview analysis.",
+                    "confidence_score": round(0.9 - 0.05 * rank, 2),
+                    "required_skills": [],
+                    "learning_path": "Take an introductory course, then build small projects.",
+                    "market_job_analysis_pakistan": "Steady demand in Karachi, Lahore and Islamabad.",
+                }
+                for rank, title in enumerate(titles)
+            ]
+        }
+        if '"analysis"' in text:
+            reply["analysis"] = _canned_analysis(rng)
+        return json.dumps(reply)
+    if '"is_final_question"' in text:
+        match = _QUESTION_NUMBER_RE.search(text)
+        number, total = (int(match.group(1)), int(match.group(2))) if match else (1, 8)
+        return json.dumps({
+            "question": _FAKE_QUESTIONS[(number - 1) % len(_FAKE_QUESTIONS)],
+            "is_final_question": number >= total,
+        })
+    if '"technical_skills"' in text:
+        return json.dumps(_canned_analysis(rng))
+    return "\n".join(rng.sample(_FAKE_QUESTIONS, 5))
+
+
+def _canned_analysis(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "technical_skills": rng.sample(["programming", "python", "data analysis", "mathematics", "excel"], 2),
+        "soft_skills": rng.sample(["communication", "teamwork", "problem solving", "leadership"], 2),
+        "learning_style": "hands-on",
+        "career_interests": ["technology"],
+        "confidence_level": "medium",
+    }
@@ -0,0 +1,122 @@
+import os
+from collections import deque
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.embeddings import EMBEDDING_DIM, embed_text
+from app.services.skills import fold_skill_phrases
+
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+# Recent best-match similarities kept for threshold tuning
+SIMILARITY_SAMPLES = 1000
+
+# Words that say how a student likes something, not what they like
+INTEREST_FILLER_WORDS = {
+    "i", "im", "i'm", "am", "me", "my", "a", "an", "the", "and", "or", "of", "to", "in", "into",
+    "on", "for", "with", "about", "really", "very", "also", "like", "love", "enjoy", "interested",
+    "interest", "interests", "passionate", "want", "would", "become", "doing", "do", "things",
+}
+
+
+def interest_text(interests: str) -> str:
+    """Reduce free-text interests to their subject words, with skill synonyms folded.
+
+    "I like coding" and "interested in programming" both become "programming".
+    """
+    folded = fold_skill_phrases(interests)
+    return " ".join(word for word in folded.split() if word not in INTEREST_FILLER_WORDS)
+
+
+class SemanticCache:
+    """Nearest-neighbour cache over embedded text.
+
+    Entries live in a preallocated (max_size, dim) matrix of unit vectors; a
+    lookup is one matrix-vector product and returns the closest entry if its
+    cosine similarity reaches the threshold. When full, the oldest entry is
+    overwritten.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_size: int = SEMANTIC_CACHE_SIZE,
+        dim: int = EMBEDDING_DIM,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.threshold = threshold
+        self.max_size = max_size
+        self._matrix = np.zeros((max_size, dim), dtype=np.float32)
+        self._texts: List[Optional[str]] = [None] * max_size
+        self._values: List[Any] = [None] * max_size
+        self._slots: Dict[str, int] = {}
+        self._next = 0
+        self._lock = Lock()
+        self._similarities: deque = deque(maxlen=SIMILARITY_SAMPLES)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def lookup(self, text: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, similarity) of the nearest entry above the threshold."""
+        vector = embed_text(text)
+        with self._lock:
+            if not self._slots or not vector.any():
+                self.misses += 1
+                return None
+            scores = self._matrix @ vector
+            slot = int(np.argmax(scores))
+            similarity = float(scores[slot])
+            self._similarities.append(similarity)
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._values[slot], similarity
+
+    def add(self, text: str, value: Any) -> None:
+        vector = embed_text(text)
+        if not vector.any():
+            return
+        with self._lock:
+            slot = self._slots.get(text)
+            if slot is None:
+                slot = self._next
+                self._next = (self._next + 1) % self.max_size
+                evicted = self._texts[slot]
+                if evicted is not None:
+                    del self._slots[evicted]
+                self._slots[text] = slot
+                self._texts[slot] = text
+            self._matrix[slot] = vector
+            self._values[slot] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrix[:] = 0
+            self._texts = [None] * self.max_size
+            self._values = [None] * self.max_size
+            self._slots.clear()
+            self._next = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        samples = np.asarray(self._similarities, dtype=np.float32)
+        return {
+            "size": len(self._slots),
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            # Distribution of best-match similarity, to pick the threshold from
+            "similarity_p10": round(float(np.percentile(samples, 10)), 4) if samples.size else None,
+            "similarity_p50": round(float(np.percentile(samples, 50)), 4) if samples.size else None,
+            "similarity_p90": round(float(np.percentile(samples, 90)), 4) if samples.size else None,
+            "similarity_samples": int(samples.size),
+        }
@@ -0,0 +1,234 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from app.services.catalog import CatalogListener, career_catalog
+
+# Canonical skill -> aliases folded into it
+SKILL_SYNONYMS: Dict[str, List[str]] = {
+    "programming": ["coding", "software development", "computer programming"],
+    "problem solving": ["problem-solving", "solving problems", "troubleshooting problems"],
+    "teamwork": ["team work", "collaboration", "working in teams", "team player"],
+    "communication": ["communication skills", "verbal communication", "written communication"],
+    "leadership": ["team leadership", "leading teams"],
+    "critical thinking": ["logical thinking", "logical reasoning"],
+    "analytical thinking": ["analytical skills", "analysis skills"],
+    "data analysis": ["data analytics", "analyzing data", "data analyst"],
+    "data visualization": ["data visualisation", "dashboards"],
+    "machine learning": ["ml", "machine-learning"],
+    "deep learning": ["dl", "neural networks"],
+    "javascript": ["js", "java script"],
+    "node.js": ["nodejs", "node js", "node"],
+    "python": ["python programming", "python3"],
+    "sql": ["structured query language", "mysql", "postgresql", "postgres"],
+    "databases": ["database", "dbms"],
+    "ui/ux design": ["ui design", "ux design", "ui ux design", "user interface design", "user experience design"],
+    "mathematics": ["math", "maths"],
+    "statistics": ["stats", "statistical analysis"],
+    "excel": ["ms excel", "microsoft excel", "spreadsheets"],
+    "project management": ["managing projects"],
+    "attention to detail": ["detail oriented", "detail-oriented", "attention to details"],
+    "research": ["research skills", "researching"],
+    "writing": ["content writing", "creative writing", "technical writing"],
+    "teaching": ["tutoring", "mentoring"],
+    "cloud computing": ["cloud", "aws", "azure", "gcp"],
+    "ci/cd": ["cicd", "continuous integration"],
+    "backup and recovery": ["backup & recovery"],
+    "empathy": ["empathetic", "caring"],
+}
+
+_ALIASES: Dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in SKILL_SYNONYMS.items()
+    for alias in aliases
+}
+_PUNCTUATION_RE = re.compile(r"[^a-z0-9+#./ ]+")
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, strip punctuation and fold synonyms into a canonical skill."""
+    text = " ".join(str(skill or "").lower().replace("&", " and ").split())
+    if text in _ALIASES:
+        return _ALIASES[text]
+    text = " ".join(_PUNCTUATION_RE.sub(" ", text).split())
+    return _ALIASES.get(text, text)
+
+
+def normalize_skills(skills: Optional[Iterable[Any]]) -> List[str]:
+    """Normalized, de-duplicated skills in first-seen order."""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    seen: Dict[str, None] = {}
+    for skill in skills:
+        normalized = normalize_skill(skill)
+        if normalized:
+            seen.setdefault(normalized, None)
+    return list(seen)
+
+
+def fold_skill_phrases(text: str, max_words: int = 3) -> str:
+    """Replace skill aliases inside free text with their canonical skill.
+
+    Matches the longest alias phrase first, so "software development" folds
+    to "programming" before "development" is considered on its own.
+    """
+    words = _PUNCTUATION_RE.sub(" ", str(text or "").lower()).split()
+    folded: List[str] = []
+    i = 0
+    while i < len(words):
+        for size in range(min(max_words, len(words) - i), 0, -1):
+            canonical = _ALIASES.get(" ".join(words[i:i + size]))
+            if canonical is not None:
+                folded.append(canonical)
+                i += size
+                break
+        else:
+            folded.append(words[i])
+            i += 1
+    return " ".join(folded)
+
+
+@dataclass
+class SkillMatch:
+    key: str
+    title: str
+    jaccard: float
+    overlap: int
+    matched_skills: List[str] = field(default_factory=list)
+    missing_skills: List[str] = field(default_factory=list)
+
+
+class SkillIndex(CatalogListener):
+    """Skill vocabulary, skill -> career inverted index and per-career bitsets.
+
+    Each career's required skills are packed into a row of uint64 words, so a
+    student's skills are scored against every career with one AND, a lookup
+    table popcount and a vectorized Jaccard.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.inverted: Dict[int, Set[int]] = defaultdict(set)
+        self._rows: Dict[int, int] = {}
+        self._career_ids: List[int] = []
+        self._career_skills: List[List[int]] = []
+        self._careers: List[Dict[str, Any]] = []
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+        self._sizes = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._career_ids)
+
+    def rebuild(self, careers: List[Dict[str, Any]]) -> None:
+        self._reset()
+        for career in careers:
+            self._add(career)
+
+    def upsert(self, career: Dict[str, Any]) -> None:
+        self._discard(career["id"])
+        self._add(career)
+
+    def remove(self, career_id: int) -> None:
+        self._discard(career_id)
+
+    def careers_with_skill(self, skill: str) -> List[Dict[str, Any]]:
+        """Careers that require the given skill, via the inverted index."""
+        skill_id = self.vocabulary.get(normalize_skill(skill))
+        if skill_id is None:
+            return []
+        return [self._careers[self._rows[career_id]] for career_id in self.inverted[skill_id]]
+
+    def score(self, skills: Iterable[Any], top_k: int = 10) -> List[SkillMatch]:
+        """Rank careers by Jaccard overlap between their required skills and `skills`."""
+        student = normalize_skills(skills)
+        if not student or not self._career_ids:
+            return []
+
+        known = [self.vocabulary[skill] for skill in student if skill in self.vocabulary]
+        query = self._pack(known)
+        overlap = _POPCOUNT_TABLE[(self._bits & query).view(np.uint8)]
+        overlap = overlap.reshape(len(self._career_ids), -1).sum(axis=1, dtype=np.int64)
+        union = self._sizes + len(student) - overlap
+        jaccard = np.divide(overlap, union, out=np.zeros(len(overlap)), where=union > 0)
+
+        order = np.argsort(-jaccard, kind="stable")
+        known_set = set(known)
+        matches: List[SkillMatch] = []
+        seen_keys: Set[str] = set()
+        for row in order:
+            if overlap[row] == 0 or len(matches) >= top_k:
+                break
+            career = self._careers[row]
+            if career["key"] in seen_keys:
+                continue
+            seen_keys.add(career["key"])
+            skill_ids = self._career_skills[row]
+            matches.append(SkillMatch(
+                key=career["key"],
+                title=career["title"],
+                jaccard=round(float(jaccard[row]), 4),
+                overlap=int(overlap[row]),
+                matched_skills=[self.terms[i] for i in skill_ids if i in known_set],
+                missing_skills=[self.terms[i] for i in skill_ids if i not in known_set],
+            ))
+        return matches
+
+    def _term_id(self, skill: str) -> int:
+        skill_id = self.vocabulary.get(skill)
+        if skill_id is None:
+            skill_id = len(self.terms)
+            self.vocabulary[skill] = skill_id
+            self.terms.append(skill)
+            words_needed = skill_id // 64 + 1
+            if words_needed > self._bits.shape[1]:
+                padding = np.zeros((self._bits.shape[0], words_needed - self._bits.shape[1]), dtype=np.uint64)
+                self._bits = np.hstack([self._bits, padding])
+        return skill_id
+
+    def _pack(self, skill_ids: Iterable[int]) -> np.ndarray:
+        row = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for skill_id in skill_ids:
+            row[skill_id // 64] |= np.uint64(1) << np.uint64(skill_id % 64)
+        return row
+
+    def _add(self, career: Dict[str, Any]) -> None:
+        skill_ids = [self._term_id(skill) for skill in normalize_skills(career.get("required_skills"))]
+        career_id = career["id"]
+        for skill_id in skill_ids:
+            self.inverted[skill_id].add(career_id)
+
+        self._rows[career_id] = len(self._career_ids)
+        self._career_ids.append(career_id)
+        self._career_skills.append(skill_ids)
+        self._careers.append(career)
+        self._bits = np.vstack([self._bits, self._pack(skill_ids)[None, :]])
+        self._sizes = np.append(self._sizes, len(skill_ids))
+
+    def _discard(self, career_id: int) -> None:
+        row = self._rows.pop(career_id, None)
+        if row is None:
+            return
+        for skill_id in self._career_skills[row]:
+            self.inverted[skill_id].discard(career_id)
+
+        del self._career_ids[row]
+        del self._career_skills[row]
+        del self._careers[row]
+        self._bits = np.delete(self._bits, row, axis=0)
+        self._sizes = np.delete(self._sizes, row)
+        self._rows = {cid: index for index, cid in enumerate(self._career_ids)}
+
+
+# Global instance, kept current through the career catalog
+skill_index = SkillIndex()
+career_catalog.subscribe(skill_index)
@@ -0,0 +1,108 @@
+import json
+from typing import Any, List, Optional
+
+
+class JSONArrayStreamParser:
+    """Incrementally extract complete items from a JSON array as text arrives.
+
+    Feed it chunks of a JSON document (for example streamed LLM output); each
+    call returns the array elements whose closing brace arrived in that
+    chunk. With `key`, the array is the value of that object key; otherwise
+    it is the first array in the text. Text before the array (such as a
+    markdown code fence) is ignored.
+
+    With `strict`, for whole JSON files, the document must be an array
+    (ValueError otherwise) and scalar elements are returned as well.
+    """
+
+    def __init__(self, key: Optional[str] = None, strict: bool = False):
+        self.key = key
+        self.strict = strict
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        if self.done:
+            return []
+        self._buffer += chunk
+        if not self._in_array and not self._find_array_start():
+            return []
+
+        items: List[Any] = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+                if self.strict and self._depth == 0 and self._start is None:
+                    self._start = pos
+            elif char in "{[":
+                if self._depth == 0:
+                    self._start = pos
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    if self._start is not None:
+                        items.append(self._scalar(buffer, pos))
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(json.loads(buffer[self._start:pos + 1]))
+                    self._start = None
+            elif self.strict and self._depth == 0:
+                if char == ",":
+                    if self._start is not None:
+                        items.append(self._scalar(buffer, pos))
+                elif not char.isspace() and self._start is None:
+                    self._start = pos
+            pos += 1
+
+        # Drop consumed text so the buffer only holds the item in progress
+        keep_from = self._start if self._start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    def _scalar(self, buffer: str, end: int) -> Any:
+        value = json.loads(buffer[self._start:end])
+        self._start = None
+        return value
+
+    def _find_array_start(self) -> bool:
+        if self.strict and self.key is None:
+            text = self._buffer.lstrip()
+            if not text:
+                return False
+            if text[0] != "[":
+                raise ValueError(f"Expected a JSON array, found {text[:20]!r}")
+        search_from = 0
+        if self.key is not None:
+            key_at = self._buffer.find(json.dumps(self.key))
+            if key_at < 0:
+                return False
+            search_from = key_at + len(json.dumps(self.key))
+        bracket = self._buffer.find("[", search_from)
+        if bracket < 0:
+            return False
+        self._buffer = self._buffer[bracket + 1:]
+        self._pos = 0
+        self._in_array = True
+        return True
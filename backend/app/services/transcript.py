@@ -0,0 +1,166 @@
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.services.skills import SKILL_SYNONYMS, fold_skill_phrases, skill_index
+
+# Most recent Q&A turns kept verbatim in the dynamic interview prompt
+TRANSCRIPT_VERBATIM_TURNS = int(os.getenv("TRANSCRIPT_VERBATIM_TURNS", "3"))
+# Estimated token budget for the whole Q&A section of the prompt
+TRANSCRIPT_TOKEN_BUDGET = int(os.getenv("TRANSCRIPT_TOKEN_BUDGET", "600"))
+# Words kept from each folded answer as a highlight
+HIGHLIGHT_WORDS = 20
+MAX_SKILL_WORDS = 3
+
+
+ANALYSIS_DEFAULTS = {
+    "technical_skills": [],
+    "soft_skills": [],
+    "learning_style": "",
+    "career_interests": [],
+    "confidence_level": "medium"
+}
+ANALYSIS_LIST_FIELDS = ("technical_skills", "soft_skills", "career_interests")
+ANALYSIS_TEXT_FIELDS = ("learning_style", "confidence_level")
+
+
+def normalize_analysis(raw: Any) -> Dict[str, Any]:
+    """Coerce a skill analysis parsed from LLM output to the response schema.
+
+    Missing or null fields get defaults, a string where a list belongs
+    becomes a one-item list, and list items and text fields become strings.
+    """
+    raw = raw if isinstance(raw, dict) else {}
+    analysis = dict(ANALYSIS_DEFAULTS)
+    for name in ANALYSIS_LIST_FIELDS:
+        value = raw.get(name)
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, (list, tuple)):
+            analysis[name] = [str(item).strip() for item in value if item is not None and str(item).strip()]
+    for name in ANALYSIS_TEXT_FIELDS:
+        value = raw.get(name)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            analysis[name] = str(value)
+    return analysis
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English)."""
+    return math.ceil(len(text or "") / 4)
+
+
+@dataclass
+class TranscriptSummary:
+    """Running summary of the interview turns that are no longer sent verbatim."""
+
+    turns: int = 0
+    skills: Dict[str, int] = field(default_factory=dict)
+    highlights: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TranscriptSummary":
+        data = data or {}
+        return cls(
+            turns=int(data.get("turns", 0)),
+            skills=dict(data.get("skills") or {}),
+            highlights=list(data.get("highlights") or []),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"turns": self.turns, "skills": dict(self.skills), "highlights": list(self.highlights)}
+
+    def fold(self, question_number: int, answer: str) -> None:
+        """Fold one turn into the summary."""
+        for skill in extract_skills(answer):
+            self.skills[skill] = self.skills.get(skill, 0) + 1
+        words = (answer or "").split()
+        if words:
+            clipped = " ".join(words[:HIGHLIGHT_WORDS]) + (" ..." if len(words) > HIGHLIGHT_WORDS else "")
+            self.highlights.append(f"A{question_number}: {clipped}")
+        self.turns = question_number
+
+    def render(self, max_highlights: Optional[int] = None) -> str:
+        if not self.turns:
+            return ""
+        skills = sorted(self.skills, key=lambda skill: (-self.skills[skill], skill))
+        highlights = self.highlights if max_highlights is None else self.highlights[len(self.highlights) - max_highlights:]
+        lines = [f"Summary of answers 1-{self.turns}:"]
+        lines.append(f"Skills mentioned so far: {', '.join(skills) if skills else 'none yet'}")
+        if highlights and max_highlights != 0:
+            lines.append("Key points:")
+            lines.extend(f"- {highlight}" for highlight in highlights)
+        return "\n".join(lines) + "\n\n"
+
+
+def extract_skills(text: str, vocabulary: Optional[Set[str]] = None) -> List[str]:
+    """Known skills mentioned in free text, after folding synonyms."""
+    vocabulary = vocabulary if vocabulary is not None else known_skills()
+    words = fold_skill_phrases(text).split()
+    found: Dict[str, None] = {}
+    for size in range(MAX_SKILL_WORDS, 0, -1):
+        for i in range(len(words) - size + 1):
+            phrase = " ".join(words[i:i + size])
+            if phrase in vocabulary:
+                found.setdefault(phrase, None)
+    return list(found)
+
+
+def known_skills() -> Set[str]:
+    return set(skill_index.vocabulary) | set(SKILL_SYNONYMS)
+
+
+def compact_transcript(
+    questions: Sequence[str],
+    responses: Sequence[str],
+    summary: Optional[TranscriptSummary] = None,
+    keep_last: int = TRANSCRIPT_VERBATIM_TURNS,
+    token_budget: int = TRANSCRIPT_TOKEN_BUDGET,
+) -> Tuple[str, TranscriptSummary]:
+    """Build the Q&A context: a summary of older turns plus the last turns verbatim.
+
+    `summary` is updated in place with any turns that have newly fallen out
+    of the verbatim window, so a stored summary is only ever extended by one
+    turn per call. The result is trimmed to stay within `token_budget`:
+    older highlights go first, then verbatim answers are clipped.
+    """
+    summary = summary or TranscriptSummary()
+    # The newest answer may not be committed yet, so it is never folded
+    keep_last = max(keep_last, 1)
+    turns = list(zip(questions, responses))
+    fold_until = max(len(turns) - keep_last, 0)
+    for number in range(summary.turns + 1, fold_until + 1):
+        summary.fold(number, turns[number - 1][1])
+
+    # A stored summary can run ahead if the client restarted the transcript
+    start = min(summary.turns, len(turns))
+    recent = [(number, q, r) for number, (q, r) in enumerate(turns[start:], start + 1)]
+
+    max_highlights = len(summary.highlights)
+    answer_words: Optional[int] = None
+    while True:
+        context = summary.render(max_highlights) + _render_turns(recent, answer_words)
+        if estimate_tokens(context) <= token_budget:
+            return context, summary
+        if max_highlights > 0:
+            max_highlights -= 1
+        elif answer_words is None or answer_words > HIGHLIGHT_WORDS:
+            longest = max((len(r.split()) for _, _, r in recent), default=0)
+            answer_words = (answer_words or longest) // 2
+            if answer_words <= HIGHLIGHT_WORDS:
+                answer_words = HIGHLIGHT_WORDS
+        else:
+            # Nothing left to trim; send it over budget rather than drop turns
+            return context, summary
+
+
+def _render_turns(turns: Iterable[Tuple[int, str, str]], answer_words: Optional[int] = None) -> str:
+    context = ""
+    for number, question, response in turns:
+        if answer_words is not None:
+            words = response.split()
+            if len(words) > answer_words:
+                response = " ".join(words[:answer_words]) + " ..."
+        context += f"Q{number}: {question}\nA{number}: {response}\n\n"
+    return context
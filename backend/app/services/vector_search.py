@@ -1 +1,232 @@
-# Placeholder for vector search service (Pinecone, FAISS, etc.) 
\ No newline at end of file
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.embeddings import (
+    EMBEDDING_DIM,
+    EMBEDDING_VERSION,
+    career_to_text,
+    embed_texts,
+    skills_to_text,
+)
+
+# Metadata key holding each career vector's content hash
+HASH_METADATA_KEY = "content_hash"
+
+
+@dataclass
+class VectorMatch:
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class QueryResult:
+    matches: List[VectorMatch]
+
+
+@dataclass
+class VectorRecord:
+    id: str
+    values: List[float]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FetchResult:
+    vectors: Dict[str, VectorRecord]
+
+
+class LocalVectorIndex:
+    """In-process vector index with the same query shape as a Pinecone index.
+
+    All embeddings live in one contiguous float32 matrix, so a query is a single
+    matrix-vector product followed by an argpartition for the top-k rows.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIM):
+        self.dimension = dimension
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        self._matrix = np.zeros((0, dimension), dtype=np.float32)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @classmethod
+    def from_matrix(
+        cls,
+        ids: Sequence[str],
+        matrix: np.ndarray,
+        metadata: Sequence[Dict[str, Any]],
+    ) -> "LocalVectorIndex":
+        """Wrap an existing (possibly memory-mapped) matrix without copying it."""
+        index = cls(matrix.shape[1])
+        index._ids = list(ids)
+        index._positions = {vector_id: row for row, vector_id in enumerate(index._ids)}
+        index._metadata = [dict(meta) for meta in metadata]
+        index._matrix = matrix
+        return index
+
+    def upsert(self, vectors: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or replace vectors given as Pinecone-style dicts."""
+        with self._lock:
+            return self._upsert(vectors)
+
+    def _upsert(self, vectors: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+        if not self._matrix.flags.writeable:
+            # Copy a read-only memory-mapped matrix before the first write
+            self._matrix = np.array(self._matrix, dtype=np.float32)
+        new_rows = []
+        for item in vectors:
+            vector_id = str(item["id"])
+            values = np.asarray(item["values"], dtype=np.float32)
+            if values.shape != (self.dimension,):
+                raise ValueError(f"Vector {vector_id} has shape {values.shape}, expected ({self.dimension},)")
+            metadata = dict(item.get("metadata") or {})
+
+            position = self._positions.get(vector_id)
+            if position is not None and position < len(self._ids):
+                self._matrix[position] = values
+                self._metadata[position] = metadata
+            elif position is not None:
+                new_rows[position - len(self._ids)] = (vector_id, values, metadata)
+            else:
+                self._positions[vector_id] = len(self._ids) + len(new_rows)
+                new_rows.append((vector_id, values, metadata))
+
+        if new_rows:
+            block = np.stack([values for _, values, _ in new_rows])
+            self._matrix = np.ascontiguousarray(np.vstack([self._matrix, block]), dtype=np.float32)
+            for vector_id, _, metadata in new_rows:
+                self._ids.append(vector_id)
+                self._metadata.append(metadata)
+
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Remove vectors by id, keeping the matrix contiguous."""
+        with self._lock:
+            self._delete(ids)
+
+    def _delete(self, ids: Sequence[str]) -> None:
+        doomed = {self._positions[i] for i in ids if i in self._positions}
+        if not doomed:
+            return
+        keep = [row for row in range(len(self._ids)) if row not in doomed]
+        self._matrix = np.ascontiguousarray(self._matrix[keep])
+        self._ids = [self._ids[row] for row in keep]
+        self._metadata = [self._metadata[row] for row in keep]
+        self._positions = {vector_id: row for row, vector_id in enumerate(self._ids)}
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100) -> Iterator[List[str]]:
+        """Yield pages of vector ids, like Pinecone's serverless list()."""
+        ids = [i for i in self._ids if prefix is None or i.startswith(prefix)]
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def fetch(self, ids: Sequence[str]) -> FetchResult:
+        """Return stored values and metadata for the given ids."""
+        vectors = {}
+        for vector_id in ids:
+            row = self._positions.get(vector_id)
+            if row is not None:
+                vectors[vector_id] = VectorRecord(
+                    id=vector_id,
+                    values=self._matrix[row].tolist(),
+                    metadata=dict(self._metadata[row]),
+                )
+        return FetchResult(vectors=vectors)
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 10,
+        include_metadata: bool = False,
+    ) -> QueryResult:
+        """Return the top_k vectors by dot product with the query vector."""
+        count = len(self._ids)
+        if count == 0 or top_k <= 0:
+            return QueryResult(matches=[])
+
+        query = np.asarray(vector, dtype=np.float32)
+        scores = self._matrix @ query
+
+        k = min(top_k, count)
+        if k < count:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(scores[top])[::-1]]
+
+        return QueryResult(matches=[
+            VectorMatch(
+                id=self._ids[row],
+                score=float(scores[row]),
+                metadata=dict(self._metadata[row]) if include_metadata else {},
+            )
+            for row in top
+        ])
+
+
+def load_career_index(
+    json_file: str = "app/db/career.json",
+    dimension: int = EMBEDDING_DIM,
+) -> LocalVectorIndex:
+    """Build a local index from the career catalog JSON file."""
+    with open(json_file, "r", encoding="utf-8") as f:
+        careers: List[Dict[str, Any]] = json.load(f)
+
+    index = LocalVectorIndex(dimension)
+    index.upsert(careers_to_vectors(careers, dimension))
+    print(f"✅ Loaded {len(index)} careers into local vector index")
+    return index
+
+
+def careers_to_vectors(careers: Sequence[Dict[str, Any]], dimension: int = EMBEDDING_DIM) -> List[Dict[str, Any]]:
+    """Embed career records in one batch as Pinecone-style upsert dicts."""
+    matrix = embed_texts(
+        [career_to_text(c.get("title", ""), c.get("description"), c.get("required_skills")) for c in careers],
+        dimension,
+    )
+    return [
+        {
+            "id": career_vector_id(career.get("title", "") or ""),
+            "values": values,
+            "metadata": {
+                "title": career.get("title", "") or "",
+                "description": career.get("description", "") or "",
+                "required_skills": skills_to_text(career.get("required_skills")),
+                HASH_METADATA_KEY: career_content_hash(career),
+            },
+        }
+        for career, values in zip(careers, matrix)
+    ]
+
+
+def career_vector_id(title: str) -> str:
+    """Stable vector id for a career, derived from its title."""
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+
+
+def career_content_hash(career: Dict[str, Any]) -> str:
+    """Hash of everything that ends up in a career's vector or its metadata."""
+    payload = json.dumps(
+        {
+            "title": career.get("title") or "",
+            "description": career.get("description") or "",
+            "required_skills": skills_to_text(career.get("required_skills")),
+            "embedding_version": EMBEDDING_VERSION,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,79 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Sequence
+
+
+class AsyncVectorStore:
+    """Async adapter over a vector index client.
+
+    Uses the client's native coroutines when it has them (Pinecone's asyncio
+    index); otherwise runs the blocking calls on a bounded thread pool so the
+    event loop is never blocked. Every call is bounded by a timeout and a
+    concurrency semaphore.
+    """
+
+    def __init__(
+        self,
+        index: Any,
+        timeout: float = 2.0,
+        max_concurrency: int = 8,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.index = index
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.native_async = inspect.iscoroutinefunction(getattr(index, "query", None))
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="vector-store"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def query(self, vector: Sequence[float], top_k: int = 10, include_metadata: bool = False):
+        return await self._call("query", vector=vector, top_k=top_k, include_metadata=include_metadata)
+
+    async def upsert(self, vectors: Sequence[Dict[str, Any]]):
+        return await self._call("upsert", vectors=vectors)
+
+    async def delete(self, ids: Sequence[str]):
+        return await self._call("delete", ids=ids)
+
+    async def close(self) -> None:
+        close = getattr(self.index, "close", None)
+        if self.native_async and close is not None:
+            await close()
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, name: str, **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        method = getattr(self.index, name)
+
+        async with self._semaphore:
+            self.calls += 1
+            if self.native_async:
+                call = method(**kwargs)
+            else:
+                call = asyncio.get_running_loop().run_in_executor(self._executor, partial(method, **kwargs))
+            try:
+                return await asyncio.wait_for(call, self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+            except Exception:
+                self.errors += 1
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "native_async": self.native_async,
+            "timeout": self.timeout,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Load the career and program catalogs from JSON into the database.
+Records are stream-parsed and hashed; only new or changed ones are written,
+with chunked INSERT ... ON CONFLICT DO UPDATE statements in one transaction
+per table, so re-running on an unchanged catalog is close to a no-op.
+"""
+
+import argparse
+import asyncio
+import sys
+from dotenv import load_dotenv
+from app.core.config import settings
+from app.db.ingest import CAREERS, DEFAULT_CHUNK_SIZE, PROGRAMS, ingest_catalog
+from app.db.session import AsyncSessionLocal
+from app.services.catalog_sync import load_sql_catalog
+from app.services.embedding_store import export_career_embeddings
+
+load_dotenv()
+
+async def ingest(careers_file: str, programs_file: str, tables: list, chunk_size: int):
+    """Ingest the selected catalogs and print a report per table."""
+    sources = {"careers": (CAREERS, careers_file), "programs": (PROGRAMS, programs_file)}
+    try:
+        for name in tables:
+            table, json_file = sources[name]
+            print(f"🔄 Ingesting {name} from {json_file}...")
+            async with AsyncSessionLocal() as session:
+                report = await ingest_catalog(session, table, json_file, chunk_size=chunk_size)
+
+            print(f"✅ {name} is in sync with {json_file}")
+            print(f"   Inserted: {report.inserted}")
+            print(f"   Updated: {report.updated}")
+            print(f"   Unchanged: {report.unchanged}")
+            print(f"   Skipped: {report.skipped}")
+            print(f"   Errors: {report.errors}")
+            print(f"   Took {report.seconds:.2f}s ({report.records_per_second:.0f} records/s)")
+
+            if name == "careers" and report.inserted + report.updated:
+                # Keep the memory-mapped embedding file the API workers load in step
+                async with AsyncSessionLocal() as session:
+                    careers = await load_sql_catalog(session)
+                store = export_career_embeddings(careers, settings.EMBEDDING_STORE_PATH)
+                print(f"💾 Wrote {len(store)} embeddings to {store.path} (catalog version {store.catalog_version[:12]})")
+                print("💡 Run populate_careers.py to sync the Pinecone index")
+
+            if report.errors:
+                # Valid records were still written; fail so the bad ones get fixed
+                raise ValueError(f"{report.errors} items in {json_file} are not JSON objects")
+
+    except Exception as e:
+        print(f"❌ Error ingesting catalog: {str(e)}")
+        print("Make sure DATABASE_URL is set in the .env file and add_content_hash_columns.py has been run")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--careers-file", default="app/db/career.json")
+    parser.add_argument("--programs-file", default="app/db/programs_with_universities.json")
+    parser.add_argument("--only", choices=["careers", "programs"], help="Ingest a single catalog")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    tables = [args.only] if args.only else ["careers", "programs"]
+    asyncio.run(ingest(args.careers_file, args.programs_file, tables, args.chunk_size))